@@ -0,0 +1,83 @@
+import asyncio
+import os
+import re
+from collections import namedtuple
+from threading import Thread
+from LCUConnector import LCUConnector, GameStartPoller
+from EventBus import EventBus
+from ClientWatcher import ClientWatcher, LOCKFILE_NAME, POLL_INTERVAL
+
+PROFILES_DIR = "profiles"
+
+Account = namedtuple("Account", ["name", "lockfile"])
+
+
+def load_accounts(config_store):
+    """Accounts listed under "accounts" in config.json, each {"name", "install_dir"}"""
+    entries = config_store.get("accounts", [])
+    return [Account(entry["name"], os.path.join(entry["install_dir"], LOCKFILE_NAME))
+            for entry in entries if entry.get("name") and entry.get("install_dir")]
+
+
+def profile_path(name):
+    """Per-account picks and bans file"""
+    return os.path.join(PROFILES_DIR, re.sub(r"[^\w.-]", "_", name) + ".json")
+
+
+class AccountManager:
+    """Runs one LCUConnector per League client on a single event loop thread.
+
+    Every account gets its own picks/bans profile. Lockfiles are checked on the shared loop and the
+    live client fallback is one shared poller, so adding accounts does not add threads. All
+    connectors publish on one bus, their status tagged with the account name.
+    """
+
+    def __init__(self, accounts):
+        os.makedirs(PROFILES_DIR, exist_ok=True)
+        self.bus = EventBus()
+        self.loop = asyncio.new_event_loop()
+        self.poller = GameStartPoller()
+        self.connectors = {}
+        self.watchers = []
+        for account in accounts:
+            self.add_account(account)
+
+    def add_account(self, account):
+        connector = LCUConnector(picks_bans_file=profile_path(account.name), loop=self.loop, poller=self.poller,
+                                 name=account.name, bus=self.bus)
+        self.connectors[account.name] = connector
+        self.watchers.append(ClientWatcher(account.lockfile, on_started=connector.attach))
+        return connector
+
+    def start(self):
+        def run_loop():
+            asyncio.set_event_loop(self.loop)
+            self.loop.call_soon(self._check_clients)
+            self.loop.run_forever()
+
+        Thread(target=run_loop, daemon=True).start()
+
+    def _check_clients(self):
+        for watcher in self.watchers:
+            watcher.check()
+        self.loop.call_later(POLL_INTERVAL, self._check_clients)
+
+    def stop(self):
+        if self.loop.is_running():
+            for connector in self.connectors.values():
+                connector.stop_connector()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    # The automation settings apply to every account
+
+    def set_auto_accept(self, enabled):
+        for connector in self.connectors.values():
+            connector.set_auto_accept(enabled)
+
+    def set_auto_select(self, enabled):
+        for connector in self.connectors.values():
+            connector.set_auto_select(enabled)
+
+    def stop_recording(self):
+        for connector in self.connectors.values():
+            connector.stop_recording()
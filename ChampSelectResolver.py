@@ -0,0 +1,94 @@
+class ChampSelectResolver:
+    """Live availability sets for champ select, so a pick or ban candidate is checked in O(1)
+    instead of being found by trial-and-error PATCH requests.
+
+    All sets hold numeric champion ids. pickable/bannable/owned stay None until known,
+    in which case they do not restrict anything.
+    """
+
+    def __init__(self):
+        self.owned = None
+        self.reset()
+
+    def reset(self):
+        """Forget everything tied to the current champ select; ownership carries over"""
+        self.banned = set()
+        self.team_picked = set()
+        self.enemy_picked = set()
+        # Refused champions per action type: a champion the client will not let us pick can still be banned
+        self.rejected = {"pick": set(), "ban": set()}
+        self.pickable = None
+        self.bannable = None
+
+    def update_session(self, session):
+        """Rebuild the ban/pick sets from a /lol-champ-select/v1/session payload"""
+        local_cell_id = session.get('localPlayerCellId')
+        my_team_cells = {member['cellId'] for member in session.get('myTeam', [])}
+
+        banned = set(session.get('bans', {}).get('myTeamBans', []))
+        banned.update(session.get('bans', {}).get('theirTeamBans', []))
+        team_picked = {member['championId'] for member in session.get('myTeam', [])
+                       if member['cellId'] != local_cell_id}
+        enemy_picked = {member['championId'] for member in session.get('theirTeam', [])}
+
+        for action_group in session.get('actions', []):
+            for action in action_group:
+                champion_id = action.get('championId')
+                if not champion_id or not action.get('completed'):
+                    continue
+                if action['type'] == 'ban':
+                    banned.add(champion_id)
+                elif action['type'] == 'pick' and action['actorCellId'] != local_cell_id:
+                    if action['actorCellId'] in my_team_cells:
+                        team_picked.add(champion_id)
+                    else:
+                        enemy_picked.add(champion_id)
+
+        # 0 means "no champion" in the LCU payloads
+        for ids in (banned, team_picked, enemy_picked):
+            ids.discard(0)
+        self.banned, self.team_picked, self.enemy_picked = banned, team_picked, enemy_picked
+
+    def set_owned(self, champion_ids):
+        self.owned = set(champion_ids)
+
+    def set_pickable(self, champion_ids):
+        self.pickable = set(champion_ids)
+
+    def set_bannable(self, champion_ids):
+        self.bannable = set(champion_ids)
+
+    def reject(self, champion_id, action_type):
+        """Remember a champion the client refused to pick or ban this session so it is not tried again"""
+        self.rejected[action_type].add(champion_id)
+
+    def can_pick(self, champion_id):
+        return (champion_id not in self.banned
+                and champion_id not in self.team_picked
+                and champion_id not in self.enemy_picked
+                and champion_id not in self.rejected["pick"]
+                and (self.owned is None or champion_id in self.owned)
+                and (self.pickable is None or champion_id in self.pickable))
+
+    def can_ban(self, champion_id):
+        return (champion_id not in self.banned
+                and champion_id not in self.team_picked
+                and champion_id not in self.enemy_picked
+                and champion_id not in self.rejected["ban"]
+                and (self.bannable is None or champion_id in self.bannable))
+
+    def first_pick(self, names, champions_map):
+        """Return (name, champion_id) of the first pickable champion in priority order, or None"""
+        return self._first(names, champions_map, self.can_pick)
+
+    def first_ban(self, names, champions_map):
+        """Return (name, champion_id) of the first bannable champion in priority order, or None"""
+        return self._first(names, champions_map, self.can_ban)
+
+    @staticmethod
+    def _first(names, champions_map, is_available):
+        for name in names:
+            champion_id = champions_map.get(name)
+            if champion_id is not None and is_available(champion_id):
+                return name, champion_id
+        return None
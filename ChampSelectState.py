@@ -0,0 +1,139 @@
+import time
+
+ACTIVE_PHASES = ('PLANNING', 'BAN_PICK', 'FINALIZATION')
+ROLES = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+
+# Change kinds reported by ChampSelectStateMachine.feed
+ENTERED = 'entered'
+EXITED = 'exited'
+PHASE = 'phase'
+ROLE = 'role'
+MY_ACTION = 'my_action'
+BOARD = 'board'
+# An update during my in-progress action that changed nothing else; it is still reported so a
+# lock-in that failed, or auto select turned on mid-turn, is tried again on the next timer update
+MY_TURN = 'my_turn'
+
+
+class ChampSelectStateMachine:
+    """Diffs each champ select session against the previous one and reports only what changed.
+
+    A session is reduced to a small snapshot (timer phase, my role, my active and pending pick
+    actions, and the state of every action). Updates that only move the timer produce the same
+    snapshot and are coalesced, except while my action is in progress (see MY_TURN). CPU time spent
+    per event is tracked for stats(), which covers the current champ select (or the last one, once
+    it exited).
+    """
+
+    def __init__(self):
+        self.active = False
+        self.phase = ''
+        self.role = None
+        self.my_action = None
+        self.my_pick_action_id = None
+        self.hovered = False
+        self._board = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.events = 0
+        self.fed = 0
+        self.coalesced = 0
+        self.cpu_ns = 0
+        self.max_cpu_ns = 0
+
+    def reset(self):
+        self.active = False
+        self.phase = ''
+        self.role = None
+        self.my_action = None
+        self.my_pick_action_id = None
+        self.hovered = False
+        self._board = None
+
+    def feed(self, session):
+        """Apply a session payload and return the set of changes (empty if nothing relevant moved)"""
+        start = time.thread_time_ns()
+        try:
+            return self._feed(session)
+        finally:
+            elapsed = time.thread_time_ns() - start
+            self.events += 1
+            self.fed += 1
+            self.cpu_ns += elapsed
+            self.max_cpu_ns = max(self.max_cpu_ns, elapsed)
+
+    def _feed(self, session):
+        phase = session.get('timer', {}).get('phase', '')
+        if phase not in ACTIVE_PHASES or not session.get('actions'):
+            if not self.active:
+                self.coalesced += 1
+                return set()
+            self.reset()
+            return {EXITED}
+
+        local_cell_id = session['localPlayerCellId']
+        role = 'TOP'
+        for teammate in session.get('myTeam', []):
+            if teammate['cellId'] == local_cell_id:
+                role = (teammate.get('assignedPosition') or 'TOP').upper()
+                break
+        if role not in ROLES:
+            role = 'TOP'
+
+        # One pass over the actions: my active action, my pending pick and the board signature
+        my_action = None
+        my_pick_action_id = None
+        board = []
+        for action_group in session['actions']:
+            for action in action_group:
+                board.append((action['id'], action.get('championId'), action.get('completed'), action.get('isInProgress')))
+                if action['actorCellId'] != local_cell_id:
+                    continue
+                if action.get('isInProgress') and not action.get('completed'):
+                    my_action = (action['id'], action['type'])
+                if action['type'] == 'pick' and not action.get('completed') and my_pick_action_id is None:
+                    my_pick_action_id = action['id']
+        board = tuple(board)
+
+        changes = set()
+        if not self.active:
+            self.active = True
+            # feed() counts this event once it returns
+            self.reset_stats()
+            changes.add(ENTERED)
+        if phase != self.phase:
+            self.phase = phase
+            changes.add(PHASE)
+        if role != self.role:
+            self.role = role
+            changes.add(ROLE)
+        if my_action != self.my_action:
+            self.my_action = my_action
+            changes.add(MY_ACTION)
+        if board != self._board:
+            self._board = board
+            changes.add(BOARD)
+        self.my_pick_action_id = my_pick_action_id
+
+        if not changes:
+            if my_action is None:
+                self.coalesced += 1
+            else:
+                changes.add(MY_TURN)
+        return changes
+
+    def note_coalesced(self):
+        """Count an event that was dropped before reaching feed() because a newer one replaced it"""
+        self.events += 1
+        self.coalesced += 1
+
+    def stats(self):
+        handled = self.events - self.coalesced
+        return {
+            'events': self.events,
+            'coalesced': self.coalesced,
+            'handled': handled,
+            'avg_cpu_us': self.cpu_ns / max(1, self.fed) / 1000,
+            'max_cpu_us': self.max_cpu_ns / 1000,
+        }
@@ -0,0 +1,161 @@
+import json
+import os
+import sys
+from Persistence import write_json_atomic
+import EventLog
+
+CATALOG_FORMAT = 1
+FIELDS = ("key", "id", "name", "title", "image")
+DDRAGON_CDN = "https://ddragon.leagueoflegends.com/cdn"
+
+
+class Champion:
+    """key is the numeric champion id the LCU uses, id the Data Dragon id, image the icon file name"""
+    __slots__ = FIELDS
+
+    def __init__(self, key, id, name, title, image):
+        self.key = key
+        self.id = id
+        self.name = name
+        self.title = title
+        self.image = image
+
+    def image_url(self, version):
+        return f"{DDRAGON_CDN}/{version}/img/champion/{self.image}"
+
+    def __repr__(self):
+        return f"Champion({self.key}, {self.name!r})"
+
+
+class ChampionCatalog:
+    """The champions of one Data Dragon version, with O(1) lookups by numeric key, id and display name.
+
+    A catalog is never modified once built; a new patch gets a new catalog, see set_catalog().
+    """
+
+    def __init__(self, version, champions):
+        self.version = version
+        self.champions = tuple(sorted(champions, key=lambda champion: champion.name))
+        self.by_key = {champion.key: champion for champion in self.champions}
+        self.by_id = {champion.id: champion for champion in self.champions}
+        self.by_name = {champion.name: champion for champion in self.champions}
+        # What champ select resolves the picks and bans lists with
+        self.keys_by_name = {champion.name: champion.key for champion in self.champions}
+
+    def __len__(self):
+        return len(self.champions)
+
+    def __iter__(self):
+        return iter(self.champions)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def names(self):
+        return self.by_name.keys()
+
+    def to_json(self):
+        return {
+            "format": CATALOG_FORMAT,
+            "version": self.version,
+            "fields": FIELDS,
+            "champions": [[getattr(champion, field) for field in FIELDS] for champion in self.champions],
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        if data.get("format") != CATALOG_FORMAT or tuple(data.get("fields", ())) != FIELDS:
+            raise ValueError("Unsupported champion catalog format")
+        return cls(data["version"], [Champion(*row) for row in data["champions"]])
+
+    @classmethod
+    def from_legacy(cls, version, champions):
+        """Convert the old {name: {"id", "key", "name", "title", "image_url"}} champion cache"""
+        return cls(version, [Champion(int(data["key"]), data["id"], name, data["title"],
+                                      data["image_url"].rsplit("/", 1)[-1])
+                             for name, data in champions.items()])
+
+    def save(self, path):
+        write_json_atomic(path, self.to_json(), ensure_ascii=False, separators=(",", ":"))
+
+
+def read_catalog(path):
+    """The catalog stored at path, or None if the file is missing or not a current catalog"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return ChampionCatalog.from_json(json.load(f))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        EventLog.get_event_log().add("champions", f"Failed to load champion catalog: {e}", EventLog.ERROR)
+        return None
+
+
+def resource_path(relative_path):
+    """ Get absolute path to resource, works for dev and for PyInstaller """
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+CATALOG_FILE = resource_path("champion_catalog.json")
+# Superseded by CATALOG_FILE, only read to migrate
+LEGACY_CACHE_FILE = resource_path("champion_cache.json")
+
+
+def version_from_url(image_url):
+    """Extract the Data Dragon version from an icon URL like .../cdn/15.13.1/img/..."""
+    parts = image_url.split("/cdn/", 1)
+    return parts[1].split("/", 1)[0] if len(parts) == 2 else None
+
+
+def load_legacy_cache():
+    """Return (version, champions) from the old champion_cache.json, or (None, None)"""
+    if os.path.exists(LEGACY_CACHE_FILE):
+        try:
+            with open(LEGACY_CACHE_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if "champions" in data and "version" in data:
+                return data["version"], data["champions"]
+            # Oldest cache: a bare dict of champions, the version only lives in the icon URLs
+            first = next(iter(data.values()), None)
+            version = version_from_url(first["image_url"]) if first else None
+            return version, data
+        except Exception as e:
+            EventLog.get_event_log().add("champions", f"Failed to load cache: {e}", EventLog.ERROR)
+    return None, None
+
+
+def load_cache():
+    """Return the cached ChampionCatalog, or None if there is no usable cache"""
+    catalog = read_catalog(CATALOG_FILE)
+    if catalog is None:
+        version, champions = load_legacy_cache()
+        if not champions:
+            return None
+        try:
+            catalog = ChampionCatalog.from_legacy(version, champions)
+            catalog.save(CATALOG_FILE)
+        except (OSError, KeyError, ValueError) as e:
+            EventLog.get_event_log().add("champions", f"Failed to convert champion cache: {e}", EventLog.ERROR)
+            return None
+    return catalog if len(catalog) else None
+
+
+_catalog = ChampionCatalog(None, ())
+_listeners = []
+
+
+def get_catalog():
+    """The current catalog, shared by the GUI and every connector"""
+    return _catalog
+
+
+def set_catalog(catalog):
+    global _catalog
+    _catalog = catalog
+    for listener in list(_listeners):
+        listener(catalog)
+
+
+def add_listener(listener):
+    _listeners.append(listener)
@@ -1,96 +1,215 @@
 import json
-import requests
-from threading import Thread
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
-                             QWidget, QLabel, QPushButton, QCheckBox, QComboBox,
-                             QScrollArea, QGridLayout, QFrame, QMessageBox, QLineEdit,
-                             QTextEdit, QTabWidget, QSplitter)
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Thread, Event
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QSize, QObject
-from PyQt5.QtGui import QPixmap, QFont, QPalette, QColor, QIcon
-from lcu_driver import Connector
 import os
 import sys
 import time
+import EventLog
+from Persistence import write_json_atomic
+from ChampionCatalog import Champion, ChampionCatalog, DDRAGON_CDN, resource_path, CATALOG_FILE, load_cache
 
+ICON_CACHE_DIR = resource_path("champion_icons")
+ICON_WORKERS = 8
+ICON_RETRIES = 3
+# ETag of every cached icon, sent on the next patch to find out which icons changed
+ICON_ETAGS_FILE = os.path.join(ICON_CACHE_DIR, "etags.json")
+
+
+def create_session(pool_size=ICON_WORKERS):
+    """Keep-alive session shared by every Data Dragon request, retrying transient failures"""
+    # Imported here, on the fetcher thread, to keep requests off the startup path
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    retry = Retry(total=ICON_RETRIES, backoff_factor=0.5,
+                  status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+def icon_path(name):
+    return os.path.join(ICON_CACHE_DIR, f"{name}.png")
+
+def load_icon_etags():
+    try:
+        with open(ICON_ETAGS_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def download_icon(name, url, session=None, etag=None, refresh=False):
+    """Download an icon into the cache; return (written, etag).
+
+    A cached icon is left alone unless refresh is set. A refresh sends the cached icon's ETag, so an unchanged icon
+    costs a 304; without an ETag the icon is downloaded again and only rewritten if its bytes changed.
+    """
+    os.makedirs(ICON_CACHE_DIR, exist_ok=True)
+    path = icon_path(name)
+    cached = os.path.exists(path)
+    if cached and not refresh:
+        return False, etag
+    try:
+        if session is None:
+            import requests
+            session = requests
+        headers = {"If-None-Match": etag} if cached and etag else {}
+        response = session.get(url, timeout=10, headers=headers)
+        if response.status_code == 304:
+            return False, etag
+        if response.status_code != 200:
+            EventLog.get_event_log().add("champions", f"Failed to download {name}: HTTP {response.status_code}",
+                                         EventLog.WARNING)
+            return False, etag
+        etag = response.headers.get("ETag")
+        if cached:
+            with open(path, "rb") as f:
+                if f.read() == response.content:
+                    return False, etag
+        # Write to a temp file first so a crash never leaves a truncated icon behind
+        tmp_path = f"{path}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(response.content)
+        os.replace(tmp_path, path)
+        return True, etag
+    except Exception as e:
+        EventLog.get_event_log().add("champions", f"Failed to download icon for {name}: {e}", EventLog.WARNING)
+        return False, etag
 
-def resource_path(relative_path):
-    """ Get absolute path to resource, works for dev and for PyInstaller """
-    if hasattr(sys, '_MEIPASS'):
-        return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(os.path.abspath("."), relative_path)
 
-CACHE_FILE = resource_path("champion_cache.json")
-ICON_CACHE_DIR = resource_path("champion_icons")
+class ChampionDataFetcher(QThread):
+    data_fetched = pyqtSignal(object)
+    error_occurred = pyqtSignal(str)
+    icon_progress = pyqtSignal(int, int)
+    icons_ready = pyqtSignal()
+    version_changed = pyqtSignal(str)
 
+    def __init__(self, parent=None, cache=None):
+        """cache is the catalog of load_cache() when the caller already read it"""
+        super().__init__(parent)
+        self.cache = cache
+        self._stop_event = Event()
 
+    def stop(self):
+        """Skip the icons that have not started downloading yet"""
+        self._stop_event.set()
 
-def load_cached_data():
-    if os.path.exists(CACHE_FILE):
+    def run(self):
+        session = create_session()
         try:
-            with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Failed to load cache: {e}")
-    return None
-
-def save_cached_data(data):
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+            self._run(session)
+        finally:
+            session.close()
+
+    def _run(self, session):
+        if self.cache:
+            # The caller read the cache and already shows it
+            catalog = self.cache
+        else:
+            catalog = load_cache()
+            if catalog:
+                # Show the cached catalog right away, the version check runs behind it
+                self.data_fetched.emit(catalog)
+        version = catalog.version if catalog else None
+        refresh = False
 
-def download_icon(name, url):
-    os.makedirs(ICON_CACHE_DIR, exist_ok=True)
-    path = os.path.join(ICON_CACHE_DIR, f"{name}.png")
-    if not os.path.exists(path):
         try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                with open(path, "wb") as f:
-                    f.write(response.content)
-            else:
-                print(f"Failed to download {name}: HTTP {response.status_code}")
+            latest_version = self.fetch_latest_version(session)
         except Exception as e:
-            print(f"Failed to download icon for {name}: {e}")
-    return path
-
+            EventLog.get_event_log().add("champions", f"Error checking Data Dragon version: {e}", EventLog.ERROR)
+            if not catalog:
+                self.error_occurred.emit(f"Failed to fetch and load champion data: {str(e)}")
+                return
+            latest_version = version
 
-class ChampionDataFetcher(QThread):
-    data_fetched = pyqtSignal(dict)
-    error_occurred = pyqtSignal(str)
-
-    def run(self):
-        cached_data = load_cached_data()
-        if cached_data:
-            self.data_fetched.emit(cached_data)
-        else:
+        if latest_version != version or not catalog:
             try:
-                version_url = "https://ddragon.leagueoflegends.com/api/versions.json"
-                response = requests.get(version_url, timeout=10)
-                versions = response.json()
-                latest_version = versions[0]
-
-                base_url = "https://ddragon.leagueoflegends.com/cdn"
-                champions_url = f"{base_url}/{latest_version}/data/en_US/champion.json"
-                response = requests.get(champions_url, timeout=10)
-                champion_data = response.json()
-
-                champions = {}
-                for champ_key, champ_data in champion_data['data'].items():
-                    champ_name = champ_data['name']
-                    image_url = f"{base_url}/{latest_version}/img/champion/{champ_data['image']['full']}"
-                    champions[champ_name] = {
-                        'id': champ_data['id'],
-                        'key': champ_data['key'],
-                        'name': champ_name,
-                        'title': champ_data['title'],
-                        'image_url': image_url
-                    }
-
-                    # Ensure icon is cached
-                    download_icon(champ_name, image_url)
-
-                save_cached_data(champions)
-                self.data_fetched.emit(champions)
-
+                fresh = self.fetch_champions(session, latest_version)
             except Exception as e:
-                print(f"Error fetching data: {e}")
-                self.error_occurred.emit(f"Failed to fetch and load champion data: {str(e)}")
\ No newline at end of file
+                EventLog.get_event_log().add("champions", f"Error fetching data: {e}", EventLog.ERROR)
+                if not catalog:
+                    self.error_occurred.emit(f"Failed to fetch and load champion data: {str(e)}")
+                    return
+            else:
+                # Icon URLs carry the patch but not whether the image changed, so a new patch rechecks every icon
+                refresh = catalog is not None
+                try:
+                    fresh.save(CATALOG_FILE)
+                except OSError as e:
+                    EventLog.get_event_log().add("champions", f"Failed to save champion catalog: {e}", EventLog.ERROR)
+                catalog = fresh
+                self.data_fetched.emit(catalog)
+                if version:
+                    self.version_changed.emit(latest_version)
+
+        self.download_icons(catalog, session, refresh)
+
+    def fetch_latest_version(self, session):
+        version_url = "https://ddragon.leagueoflegends.com/api/versions.json"
+        response = session.get(version_url, timeout=10)
+        return response.json()[0]
+
+    def fetch_champions(self, session, version):
+        champions_url = f"{DDRAGON_CDN}/{version}/data/en_US/champion.json"
+        response = session.get(champions_url, timeout=10)
+        champion_data = response.json()
+        return ChampionCatalog(version, [
+            Champion(int(champ_data['key']), champ_data['id'], champ_data['name'], champ_data['title'],
+                     champ_data['image']['full'])
+            for champ_data in champion_data['data'].values()
+        ])
+
+    def download_icons(self, catalog, session, refresh=False):
+        """Download missing icons on a bounded worker pool, reporting progress as each one lands.
+
+        With refresh, cached icons are revalidated too and replaced when they changed.
+        """
+        wanted = {champion.name: champion.image_url(catalog.version) for champion in catalog
+                  if refresh or not os.path.exists(icon_path(champion.name))}
+        total = len(wanted)
+        if not total:
+            if self.update_atlas(catalog, False):
+                self.icons_ready.emit()
+            return
+
+        etags = load_icon_etags()
+        changed = False
+        done = 0
+        self.icon_progress.emit(done, total)
+        with ThreadPoolExecutor(max_workers=ICON_WORKERS) as pool:
+            futures = {pool.submit(self._download_icon, name, url, session, etags.get(name), refresh): name
+                       for name, url in wanted.items()}
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    written, etag = result
+                    changed = changed or written
+                    if etag:
+                        etags[futures[future]] = etag
+                done += 1
+                self.icon_progress.emit(done, total)
+        try:
+            write_json_atomic(ICON_ETAGS_FILE, etags)
+        except OSError as e:
+            EventLog.get_event_log().add("champions", f"Failed to save icon ETags: {e}", EventLog.WARNING)
+        if not self._stop_event.is_set() and (self.update_atlas(catalog, changed) or changed):
+            self.icons_ready.emit()
+
+    def update_atlas(self, catalog, icons_changed):
+        """Repack the icon atlas when icons were downloaded or champions are missing from it"""
+        from IconAtlas import atlas_names, build_atlas
+        if not icons_changed and set(catalog.names()) <= atlas_names():
+            return False
+        try:
+            build_atlas(catalog.names())
+            return True
+        except Exception as e:
+            EventLog.get_event_log().add("champions", f"Failed to build icon atlas: {e}", EventLog.WARNING)
+            return False
+
+    def _download_icon(self, name, url, session, etag, refresh):
+        if self._stop_event.is_set():
+            return None
+        return download_icon(name, url, session, etag, refresh)
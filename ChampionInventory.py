@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+from Persistence import write_behind, write_json_atomic
+import EventLog
+
+INVENTORY_DIR = "inventories"
+INVENTORY_FORMAT = 1
+
+
+def is_available(champion):
+    """Whether a champions-minimal entry can be played: owned, free to play or rented"""
+    ownership = champion.get('ownership') or {}
+    return bool(ownership.get('owned') or champion.get('freeToPlay')
+                or ownership.get('rental', {}).get('rented'))
+
+
+class ChampionInventory:
+    """The champions of one summoner, cached on disk so ownership is known before the client answers.
+
+    rebuild() takes a whole champions-minimal list, update() one champion from a websocket event.
+    owned is a frozenset of numeric ids (None while the client has not reported ownership) and
+    names maps display names to ids. Both are replaced rather than modified, so other threads can
+    read them without locking. Listeners are called with the inventory after every change.
+    """
+
+    def __init__(self, summoner_id, directory=INVENTORY_DIR, write_behind=write_behind):
+        self.summoner_id = summoner_id
+        self.path = os.path.join(directory, f"{summoner_id}.json")
+        self.write_behind = write_behind
+        self.listeners = []
+        self.champions = {}
+        self.names = {}
+        self.owned = None
+        self._lock = threading.Lock()
+        self.loaded = self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") != INVENTORY_FORMAT:
+                return False
+            champions = {champion_id: (name, available) for champion_id, name, available in data["champions"]}
+            self._apply(champions, data["ownershipKnown"])
+            return True
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            EventLog.get_event_log().add("champions", f"Error loading {self.path}: {e}", EventLog.ERROR)
+            return False
+
+    def _apply(self, champions, ownership_known):
+        """Swap in champions ({id: (name, available)}) and the indexes built from it in one pass"""
+        names = {}
+        owned = set()
+        for champion_id, (name, available) in champions.items():
+            names[name] = champion_id
+            if available:
+                owned.add(champion_id)
+        with self._lock:
+            self.champions = champions
+            self.names = names
+            self.owned = frozenset(owned) if ownership_known else None
+
+    def rebuild(self, champions_minimal):
+        """Replace the inventory with a /champions-minimal list"""
+        # The list contains a "None" entry with id -1
+        champions = {champion['id']: (champion['name'], is_available(champion))
+                     for champion in champions_minimal if champion.get('id', 0) > 0}
+        ownership_known = any('ownership' in champion for champion in champions_minimal)
+        if champions == self.champions and ownership_known == (self.owned is not None):
+            return
+        self._apply(champions, ownership_known)
+        self._changed()
+
+    def update(self, champion):
+        """Apply one champion, e.g. bought or rented during the session"""
+        champion_id = champion.get('id', 0)
+        if champion_id <= 0:
+            return
+        entry = (champion.get('name'), is_available(champion))
+        if self.champions.get(champion_id) == entry:
+            return
+        champions = dict(self.champions)
+        champions[champion_id] = entry
+        # One champion says nothing about the others: only a full rebuild() makes ownership known
+        self._apply(champions, self.owned is not None)
+        self._changed()
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def _changed(self):
+        self.write_behind.schedule(self)
+        for listener in list(self.listeners):
+            listener(self)
+
+    def write(self):
+        with self._lock:
+            data = {
+                "format": INVENTORY_FORMAT,
+                "summonerId": self.summoner_id,
+                "ownershipKnown": self.owned is not None,
+                "champions": [[champion_id, name, available]
+                              for champion_id, (name, available) in self.champions.items()],
+            }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_json_atomic(self.path, data, ensure_ascii=False, separators=(",", ":"))
+        except OSError as e:
+            EventLog.get_event_log().add("champions", f"Error writing to {self.path}: {e}", EventLog.ERROR)
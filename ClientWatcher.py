@@ -0,0 +1,242 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+from collections import namedtuple
+import EventLog
+
+LOCKFILE_NAME = "lockfile"
+DEFAULT_INSTALL_DIRS = [
+    r"C:\Riot Games\League of Legends",
+    "/Applications/League of Legends.app/Contents/LoL",
+]
+POLL_INTERVAL = 1.0
+
+# inotify(7) flags
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+
+class LockfileInfo(namedtuple("LockfileInfo", ["name", "pid", "port", "password", "protocol"])):
+    """Parsed contents of the League client lockfile (name:pid:port:password:protocol)"""
+
+    def connection_string(self):
+        """The pid:pid:port:password form lcu_driver's Connection accepts"""
+        return f"{self.pid}:{self.pid}:{self.port}:{self.password}"
+
+
+def read_lockfile(path):
+    """Return the parsed lockfile, or None if it is missing or incomplete"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            parts = f.read().strip().split(":")
+        return LockfileInfo(parts[0], int(parts[1]), int(parts[2]), parts[3], parts[4])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def pid_exists(pid):
+    import psutil
+    return psutil.pid_exists(pid)
+
+
+def find_lockfile(install_dirs=None):
+    """Locate the client lockfile from known install dirs, falling back to one process scan"""
+    for directory in install_dirs or DEFAULT_INSTALL_DIRS:
+        path = os.path.join(directory, LOCKFILE_NAME)
+        if os.path.exists(path):
+            return path
+
+    import psutil
+    for proc in psutil.process_iter(['name', 'cmdline']):
+        if proc.info['name'] not in ('LeagueClientUx.exe', 'LeagueClientUx'):
+            continue
+        for arg in proc.info['cmdline'] or []:
+            if arg.startswith("--install-directory="):
+                return os.path.join(arg.split("=", 1)[1], LOCKFILE_NAME)
+    return None
+
+
+def is_client_running(lockfile_path, pid_exists=pid_exists):
+    info = read_lockfile(lockfile_path) if lockfile_path else None
+    return info is not None and pid_exists(info.pid)
+
+
+class _Inotify:
+    """Minimal inotify wrapper over libc, used to wake up as soon as the lockfile appears or goes away"""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CREATE | IN_DELETE | IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if ready:
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+        return bool(ready)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Calls check() on a background thread whenever a file may have changed.
+
+    On Linux the file's directory is watched with inotify and check() also runs every poll_interval
+    seconds; elsewhere check() is simply polled. on_check is called by the default check().
+    """
+
+    def __init__(self, path, on_check=None, poll_interval=POLL_INTERVAL):
+        self.path = path
+        self.on_check = on_check
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval * 2)
+
+    def check(self):
+        if self.on_check:
+            self.on_check()
+
+    def _run(self):
+        inotify = None
+        if sys.platform.startswith("linux"):
+            try:
+                inotify = _Inotify(os.path.dirname(os.path.abspath(self.path)))
+            except OSError as e:
+                EventLog.get_event_log().add("connection", f"inotify unavailable, polling {self.path} instead: {e}",
+                                             EventLog.WARNING)
+
+        try:
+            self.check()
+            while not self._stop_event.is_set():
+                if inotify:
+                    # File changes wake us immediately, the timeout still catches anything else
+                    inotify.wait(self.poll_interval)
+                else:
+                    self._stop_event.wait(self.poll_interval)
+                if not self._stop_event.is_set():
+                    self.check()
+        finally:
+            if inotify:
+                inotify.close()
+
+
+class ClientWatcher(FileWatcher):
+    """Watches the League client through its lockfile and PID instead of scanning the process table.
+
+    on_started(LockfileInfo) fires when a client comes up (including one already running at start),
+    on_stopped() when it goes away. The timeout of the lockfile watch catches a dead PID.
+    """
+
+    def __init__(self, lockfile_path, on_started=None, on_stopped=None,
+                 poll_interval=POLL_INTERVAL, pid_exists=pid_exists):
+        super().__init__(lockfile_path, poll_interval=poll_interval)
+        self.lockfile_path = lockfile_path
+        self.on_started = on_started
+        self.on_stopped = on_stopped
+        self.pid_exists = pid_exists
+        self.client = None
+
+    def check(self):
+        """Compare the lockfile/PID against the last known client and fire callbacks on changes"""
+        info = read_lockfile(self.lockfile_path)
+        if info is not None and not self.pid_exists(info.pid):
+            # A crashed client leaves a stale lockfile behind
+            info = None
+
+        previous, self.client = self.client, info
+        if previous is not None and (info is None or info.pid != previous.pid):
+            if self.on_stopped:
+                self.on_stopped()
+        if info is not None and (previous is None or info.pid != previous.pid):
+            if self.on_started:
+                self.on_started(info)
+        return info
+
+
+def main():
+    """Attach, detach and reattach against a temp lockfile and throwaway processes standing in for the client"""
+    import queue
+    import subprocess
+    import tempfile
+
+    def spawn():
+        return subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+
+    def write_lockfile(path, pid):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"LeagueClient:{pid}:2999:secret:https")
+
+    def expect(kind, pid=None):
+        try:
+            event = events.get(timeout=5)
+        except queue.Empty:
+            raise SystemExit(f"FAIL: no {kind} within 5s")
+        if event != (kind, pid):
+            raise SystemExit(f"FAIL: expected {(kind, pid)}, got {event}")
+        print(f"ok {kind}" + (f" pid {pid}" if pid else ""))
+
+    events = queue.Queue()
+    processes = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, LOCKFILE_NAME)
+        watcher = ClientWatcher(path, on_started=lambda info: events.put(("started", info.pid)),
+                                on_stopped=lambda: events.put(("stopped", None)), poll_interval=0.2)
+        try:
+            first = spawn()
+            processes.append(first)
+            write_lockfile(path, first.pid)
+            watcher.start()
+            expect("started", first.pid)
+
+            # A crash leaves the lockfile behind: the dead PID alone detaches
+            first.kill()
+            first.wait()
+            expect("stopped")
+
+            second = spawn()
+            processes.append(second)
+            write_lockfile(path, second.pid)
+            expect("started", second.pid)
+
+            # A clean exit removes the lockfile
+            os.remove(path)
+            expect("stopped")
+        finally:
+            watcher.stop()
+            for process in processes:
+                process.kill()
+                process.wait()
+    if not events.empty():
+        raise SystemExit(f"FAIL: unexpected {events.get()}")
+    print("ClientWatcher attach/detach/reattach ok")
+
+
+if __name__ == "__main__":
+    main()
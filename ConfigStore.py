@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+from ClientWatcher import FileWatcher
+from Persistence import write_behind, write_json_atomic
+import EventLog
+
+CONFIG_FILE = "config.json"
+
+
+class ConfigStore:
+    """config.json loaded once and served from memory.
+
+    set() changes memory right away and leaves the write to the shared write-behind thread,
+    so a burst of changes is one atomic write. watch() reloads the file when something else
+    edits it. Listeners are called with the set of changed top-level keys, on the thread that
+    made the change (the watcher thread for external edits).
+    """
+
+    def __init__(self, path=CONFIG_FILE, write_behind=write_behind):
+        self.path = path
+        self.write_behind = write_behind
+        self.listeners = []
+        self.watcher = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._written_version = 0
+        # Keys set() changed since the last write took its snapshot
+        self._pending = {}
+        self._stat = None
+        self.data = self._read() or {}
+
+    def _file_stat(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _read(self):
+        """Parse the file, or None if it is missing or invalid (e.g. half-saved by an editor)"""
+        stat = self._file_stat()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        self._stat = stat
+        return data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        with self._lock:
+            if self.data.get(key) == value:
+                return
+            data = dict(self.data)
+            data[key] = value
+            self.data = data
+            self._pending[key] = value
+            self._version += 1
+        self.write_behind.schedule(self)
+        self._notify({key})
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _notify(self, keys):
+        for listener in list(self.listeners):
+            try:
+                listener(keys)
+            except Exception as e:
+                EventLog.get_event_log().add("settings", f"Error in config listener: {e}", EventLog.ERROR)
+
+    def write(self):
+        with self._write_lock:
+            with self._lock:
+                version, data = self._version, self.data
+                pending, self._pending = self._pending, {}
+            if version == self._written_version:
+                return
+            try:
+                write_json_atomic(self.path, data, indent=4)
+                self._written_version = version
+                # Our own write must not look like an external edit to the watcher
+                self._stat = self._file_stat()
+            except OSError as e:
+                with self._lock:
+                    self._pending = {**pending, **self._pending}
+                EventLog.get_event_log().add("settings", f"Error saving {self.path}: {e}", EventLog.ERROR)
+
+    def flush(self):
+        self.write_behind.cancel(self)
+        self.write()
+
+    def reload(self):
+        """Pick up an external edit of the file and notify listeners of the keys it changed"""
+        if self._file_stat() == self._stat:
+            return
+        with self._write_lock:
+            # A write that finished while we waited for the lock is our own, not an external edit
+            if self._file_stat() == self._stat:
+                return
+            data = self._read()
+            if data is None:
+                return
+            with self._lock:
+                # Values set() has not saved yet win over the file; their scheduled write saves them
+                data.update(self._pending)
+                old, self.data = self.data, data
+        changed = {key for key in old.keys() | data.keys() if old.get(key) != data.get(key)}
+        if changed:
+            self._notify(changed)
+
+    def watch(self):
+        if self.watcher is None:
+            self.watcher = FileWatcher(self.path, on_check=self.reload)
+            self.watcher.start()
+
+    def stop(self):
+        if self.watcher:
+            self.watcher.stop()
+        self.flush()
+
+
+_config_store = None
+_config_lock = threading.Lock()
+
+
+def get_config_store():
+    """The process-wide store of config.json"""
+    global _config_store
+    with _config_lock:
+        if _config_store is None:
+            _config_store = ConfigStore()
+        return _config_store
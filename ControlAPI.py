@@ -0,0 +1,225 @@
+import asyncio
+import json
+from threading import Thread
+from aiohttp import web, WSCloseCode
+from yarl import URL
+from EventBus import STATE_CHANGED
+from Persistence import ROLES, ROLE_ALIASES, PicksBansStore
+import EventLog
+
+HOST = "127.0.0.1"
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+@web.middleware
+async def local_only(request, handler):
+    """Only answer requests addressed to this machine, and none made by web pages on other sites"""
+    origin = request.headers.get("Origin")
+    if request.url.host not in LOCAL_HOSTS or (origin and URL(origin).host not in LOCAL_HOSTS):
+        raise web.HTTPForbidden(text="The control API only accepts local requests")
+    return await handler(request)
+
+
+class ControlServer:
+    """Localhost HTTP and websocket API over the connectors, for stream decks and scripts.
+
+    GET  /state                 state() of every connector, see LCUConnector.state()
+    POST /automation            {"auto_accept": bool, "auto_select": bool}, either can be left out
+    GET  /picks-bans/{role}     the picks and bans of a role; roles are ROLES or ROLE_ALIASES, in any case
+    PUT  /picks-bans/{role}     {"picks": [...], "bans": [...]}, either can be left out
+    PUT  /picks-bans            {role: {"picks": [...], "bans": [...]}, ...}, roles left out are kept
+    GET  /ws                    websocket, sends {"type": "state", "connectors": [...]} on connect and
+                                after every change
+
+    Picks and bans go to the first account unless ?account=NAME is given. The server runs on its own
+    thread and event loop; connectors only schedule a push on it, so API clients never hold up
+    champ select.
+    """
+
+    def __init__(self, controller, port, host=HOST):
+        self.controller = controller
+        self.connectors = list(controller.connectors.values()) if hasattr(controller, "connectors") else [controller]
+        self.host = host
+        self.port = port
+        self.event_log = EventLog.get_event_log()
+        self.sockets = set()
+        self.loop = None
+        self.runner = None
+        self.thread = None
+        self._push_pending = False
+        self._last_message = None
+
+    def log(self, message, level=EventLog.INFO):
+        self.event_log.add("control", message, level)
+
+    def start(self):
+        self.thread = Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+            self.thread.join(timeout=2)
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        app = web.Application(middlewares=[local_only])
+        app.add_routes([
+            web.get("/state", self.get_state),
+            web.post("/automation", self.post_automation),
+            web.get("/picks-bans/{role}", self.get_picks_bans),
+            web.put("/picks-bans/{role}", self.put_role_picks_bans),
+            web.put("/picks-bans", self.put_picks_bans),
+            web.get("/ws", self.websocket),
+        ])
+        self.runner = web.AppRunner(app, access_log=None)
+        try:
+            self.loop.run_until_complete(self.runner.setup())
+            self.loop.run_until_complete(web.TCPSite(self.runner, self.host, self.port).start())
+        except OSError as e:
+            self.log(f"Control API could not listen on {self.host}:{self.port}: {e}", EventLog.ERROR)
+            self.loop.run_until_complete(self.runner.cleanup())
+            return
+        self.controller.bus.subscribe(STATE_CHANGED, self.on_state_changed)
+        self.log(f"Control API listening on http://{self.host}:{self.port}")
+        try:
+            self.loop.run_forever()
+        finally:
+            self.controller.bus.unsubscribe(STATE_CHANGED, self.on_state_changed)
+            self.loop.run_until_complete(self._shutdown())
+            self.loop.close()
+
+    async def _shutdown(self):
+        for ws in list(self.sockets):
+            await ws.close(code=WSCloseCode.GOING_AWAY, message=b"Shutting down")
+        await self.runner.cleanup()
+
+    def state(self):
+        return {"connectors": [connector.state() for connector in self.connectors]}
+
+    def on_state_changed(self, name):
+        # Called on a connector's loop thread: hand over to the server loop without waiting.
+        # Changes that arrive before the push runs share it.
+        if not self._push_pending:
+            self._push_pending = True
+            self.loop.call_soon_threadsafe(self._push)
+
+    def _push(self):
+        self._push_pending = False
+        if not self.sockets:
+            return
+        message = json.dumps({"type": "state", **self.state()})
+        if message == self._last_message:
+            return
+        self._last_message = message
+        # One task per client, so a slow client does not delay the others
+        for ws in list(self.sockets):
+            self.loop.create_task(self._send(ws, message))
+
+    async def _send(self, ws, message):
+        try:
+            await ws.send_str(message)
+        except (ConnectionError, RuntimeError):
+            self.sockets.discard(ws)
+
+    async def websocket(self, request):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        self.sockets.add(ws)
+        try:
+            await ws.send_str(json.dumps({"type": "state", **self.state()}))
+            # Commands go through HTTP, anything the client sends is ignored
+            async for _ in ws:
+                pass
+        finally:
+            self.sockets.discard(ws)
+        return ws
+
+    async def get_state(self, request):
+        return web.json_response(self.state())
+
+    async def post_automation(self, request):
+        body = await read_json(request)
+        setters = {"auto_accept": self.controller.set_auto_accept, "auto_select": self.controller.set_auto_select}
+        for key, value in body.items():
+            if key not in setters or not isinstance(value, bool):
+                raise web.HTTPBadRequest(text=f"Invalid {key}: expected auto_accept and/or auto_select, true or false")
+        for key, value in body.items():
+            setters[key](value)
+        return web.json_response(self.state())
+
+    def connector_for(self, request):
+        name = request.query.get("account")
+        if name is None:
+            return self.connectors[0]
+        for connector in self.connectors:
+            if connector.name == name:
+                return connector
+        raise web.HTTPNotFound(text=f"No account named {name}")
+
+    async def get_picks_bans(self, request):
+        store = self.connector_for(request).picks_bans_store
+        return web.json_response(store.snapshot()[role_from(request.match_info["role"])])
+
+    async def put_role_picks_bans(self, request):
+        connector = self.connector_for(request)
+        role = role_from(request.match_info["role"])
+        lists = checked_lists(connector, await read_json(request))
+        store = connector.picks_bans_store
+        for kind, names in lists.items():
+            store.set(role, kind, names)
+        self.log(f"Picks and bans of {role} replaced through the control API")
+        return web.json_response(store.snapshot()[role])
+
+    async def put_picks_bans(self, request):
+        connector = self.connector_for(request)
+        body = await read_json(request)
+        store = connector.picks_bans_store
+        data = store.snapshot()
+        roles = []
+        for name, entry in body.items():
+            role = role_from(name)
+            data[role].update(checked_lists(connector, entry))
+            roles.append(role)
+        store.replace(data)
+        self.log(f"Picks and bans of {', '.join(roles)} replaced through the control API")
+        return web.json_response(data)
+
+
+async def read_json(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text="The body must be JSON")
+    if not isinstance(body, dict):
+        raise web.HTTPBadRequest(text="The body must be a JSON object")
+    return body
+
+
+def role_from(name):
+    role = PicksBansStore.role_key(name)
+    if role not in ROLES:
+        raise web.HTTPNotFound(text=f"Unknown role {name}, expected one of {', '.join(ROLES)} "
+                                    f"or {', '.join(ROLE_ALIASES)}, in any case")
+    return role
+
+
+def checked_lists(connector, entry):
+    """The picks and bans lists of entry, after checking they name known champions"""
+    if not isinstance(entry, dict):
+        raise web.HTTPBadRequest(text='Expected {"picks": [...], "bans": [...]}')
+    lists = {}
+    for kind in ("picks", "bans"):
+        if kind not in entry:
+            continue
+        names = entry[kind]
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise web.HTTPBadRequest(text=f"{kind} must be a list of champion names")
+        # Without a catalog or client yet there is nothing to check against
+        unknown = [name for name in names if name not in connector.champions_map] if connector.champions_map else []
+        if unknown:
+            raise web.HTTPBadRequest(text=f"Unknown champions in {kind}: {', '.join(unknown)}")
+        lists[kind] = names
+    return lists
@@ -0,0 +1,32 @@
+import EventLog
+
+STATUS_CHANGED = "status_changed"
+# Published with the connector name when anything in LCUConnector.state() changes
+STATE_CHANGED = "state_changed"
+
+
+class EventBus:
+    """Publish/subscribe for the automation core, which stays free of Qt.
+
+    Subscribers run synchronously on the publishing thread, usually the connector's event loop,
+    so they must be cheap. QtBridge turns topics into Qt signals for the GUI thread.
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+
+    def subscribe(self, topic, callback):
+        self._subscribers.setdefault(topic, []).append(callback)
+        return callback
+
+    def unsubscribe(self, topic, callback):
+        callbacks = self._subscribers.get(topic, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def publish(self, topic, *args):
+        for callback in tuple(self._subscribers.get(topic, ())):
+            try:
+                callback(*args)
+            except Exception as e:
+                EventLog.get_event_log().add("events", f"Error in {topic} subscriber: {e}", EventLog.ERROR)
@@ -0,0 +1,86 @@
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+
+INFO = "INFO"
+WARNING = "WARNING"
+ERROR = "ERROR"
+LOG_SIZE = 1000
+LOG_FILE_MAX_BYTES = 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+Event = namedtuple("Event", ["seq", "time", "level", "kind", "source", "message"])
+
+
+class EventLog:
+    """The last size events in memory, and optionally a rotating log file.
+
+    add() is a lock and a deque append, safe from any thread and cheap enough for hot handlers.
+    The file is written by a logging QueueListener thread, so add() never waits on the disk.
+    Readers poll with since(seq) instead of being called per event, see EventLogWidget.
+    Listeners are called on the adding thread; keep them as cheap as add() itself.
+    """
+
+    def __init__(self, size=LOG_SIZE):
+        self.events = deque(maxlen=size)
+        self.listeners = []
+        self.seq = 0
+        self._lock = threading.Lock()
+        self._logger = None
+        self._listener = None
+
+    def add(self, kind, message, level=INFO, source=None):
+        with self._lock:
+            self.seq += 1
+            event = Event(self.seq, time.time(), level, kind, source, message)
+            self.events.append(event)
+        if self._logger:
+            self._logger.log(getattr(logging, level), "%s [%s] %s", source or "-", kind, message)
+        for listener in list(self.listeners):
+            listener(event)
+        return event
+
+    def since(self, seq):
+        """Events newer than seq, oldest first (only those still in the buffer)"""
+        with self._lock:
+            if not self.events or self.events[-1].seq <= seq:
+                return []
+            skip = max(0, seq - self.events[0].seq + 1)
+            return list(self.events)[skip:]
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def open_file(self, path, max_bytes=LOG_FILE_MAX_BYTES, backups=LOG_FILE_BACKUPS):
+        """Also write events to path, rotated at max_bytes with backups old files kept"""
+        self.close_file()
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                       encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        records = queue.Queue()
+        self._listener = logging.handlers.QueueListener(records, handler)
+        self._listener.start()
+        logger = logging.getLogger(f"{__name__}.{id(self)}")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.handlers = [logging.handlers.QueueHandler(records)]
+        self._logger = logger
+
+    def close_file(self):
+        if self._listener:
+            self._logger = None
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+
+
+_event_log = EventLog()
+
+
+def get_event_log():
+    """The process-wide event log shared by every connector"""
+    return _event_log
@@ -0,0 +1,50 @@
+import json
+import threading
+import time
+
+RECORDING_FORMAT = 1
+
+
+class EventRecorder:
+    """Appends LCU websocket events to a JSON lines file.
+
+    The first line is a header ({"format", "started"}), every other line is
+    [ms_since_start, eventType, uri, data]. Lines are flushed as they are written
+    so a recording survives the app crashing on the event being investigated.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write(json.dumps({"format": RECORDING_FORMAT, "started": time.time()}) + "\n")
+        self._file.flush()
+
+    def write(self, event):
+        elapsed_ms = round((time.perf_counter() - self._start) * 1000, 1)
+        line = json.dumps([elapsed_ms, event.type, event.uri, event.data], ensure_ascii=False, separators=(",", ":"))
+        # Recording can be stopped from the GUI thread while the connector thread writes
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def read_recording(path):
+    """Yield (ms_since_start, event_type, uri, data) for every event in a recording"""
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != RECORDING_FORMAT:
+            raise ValueError(f"{path} is not a recording in format {RECORDING_FORMAT}")
+        for line in f:
+            if line.strip():
+                elapsed_ms, event_type, uri, data = json.loads(line)
+                yield elapsed_ms, event_type, uri, data
@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from EventRecorder import read_recording
+import ChampionCatalog
+import LatencyStats
+
+WRITE_METHODS = ("post", "put", "patch", "delete")
+
+
+class FakeResponse:
+    def __init__(self, status, data=None):
+        self.status = status
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+
+class FakeConnection:
+    """Stands in for an lcu_driver Connection: answers from a table of canned responses and logs every request.
+
+    responses maps (method, endpoint) to (status, data). Anything else answers 204 for writes
+    and 404 for reads. latency (seconds) is added to every request.
+    """
+
+    def __init__(self, responses=None, latency=0.0):
+        self.responses = responses or {}
+        self.latency = latency
+        self.requests = []
+        self.closed = False
+
+    async def request(self, method, endpoint, **kwargs):
+        method = method.lower()
+        self.requests.append((time.perf_counter(), method, endpoint, kwargs.get("data")))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        default = (204, None) if method in WRITE_METHODS else (404, None)
+        return FakeResponse(*self.responses.get((method, endpoint), default))
+
+
+def default_responses(catalog, summoner_id=1):
+    """Summoner and champion inventory answers built from the local champion catalog"""
+    inventory = [{"id": champion.key, "name": champion.name} for champion in (catalog or ())]
+    return {
+        ("get", "/lol-summoner/v1/current-summoner"): (200, {"summonerId": summoner_id}),
+        ("get", f"/lol-champions/v1/inventories/{summoner_id}/champions-minimal"): (200, inventory),
+    }
+
+
+async def replay(lcu, path, speed=1.0, connection=None):
+    """Feed a recording through lcu's registered websocket handlers.
+
+    Events go through lcu_driver's own dispatch, one task per event like a live connection.
+    speed scales the recorded timing, 0 replays as fast as possible. Requests go to connection,
+    a FakeConnection over the champion cache by default. Returns (events, seconds).
+    """
+    connection = connection or FakeConnection(default_responses(ChampionCatalog.load_cache()))
+    connector = lcu.connector
+    await connector.run_event("ready", connection)
+
+    count = 0
+    start = time.perf_counter()
+    for elapsed_ms, event_type, uri, data in read_recording(path):
+        if speed:
+            delay = start + elapsed_ms / 1000 / speed - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        connector.ws.match_event(connector, connection, {"eventType": event_type, "uri": uri, "data": data})
+        count += 1
+        # Let the handler start before the next event arrives, as the websocket reader would
+        await asyncio.sleep(0)
+
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    while pending:
+        await asyncio.gather(*pending)
+        pending = asyncio.all_tasks() - {asyncio.current_task()}
+    return count, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded LCU event log against a fake client")
+    parser.add_argument("recording")
+    parser.add_argument("--speed", type=float, default=1.0, help="timing multiplier, 0 for as fast as possible")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake request latency in milliseconds")
+    parser.add_argument("--no-auto", action="store_true", help="replay with auto accept and auto select off")
+    parser.add_argument("--quiet", action="store_true", help="do not print connector events")
+    picks_bans = parser.add_mutually_exclusive_group()
+    picks_bans.add_argument("--picks-bans", metavar="PATH",
+                            help="picks and bans to replay with instead of picks_bans.json in the working directory")
+    picks_bans.add_argument("--random-picks-bans", action="store_true",
+                            help="replay with a few random picks and bans per role, drawn from the champion catalog")
+    parser.add_argument("--seed", type=int, help="seed for --random-picks-bans")
+    args = parser.parse_args()
+
+    # As in headless mode, resolve names through the cached catalog before the client reports its champions
+    catalog = ChampionCatalog.load_cache()
+    if catalog:
+        ChampionCatalog.set_catalog(catalog)
+    from LCUConnector import LCUConnector, PICKS_BANS_FILE
+    picks_bans_file = args.picks_bans or PICKS_BANS_FILE
+    if args.random_picks_bans:
+        if not catalog:
+            parser.error("--random-picks-bans needs a champion catalog, run the app once to download it")
+        from MockLCU import write_picks_bans
+        picks_bans_file = os.path.join(tempfile.gettempdir(), "replay_picks_bans.json")
+        write_picks_bans(catalog.names(), picks_bans_file, args.seed)
+
+    lcu = LCUConnector(picks_bans_file=picks_bans_file)
+    if not args.quiet:
+        lcu.event_log.add_listener(lambda event: print(event.message))
+    lcu.auto_accept_enabled = lcu.auto_select_enabled = not args.no_auto
+
+    connection = FakeConnection(default_responses(catalog), args.latency / 1000)
+    count, seconds = lcu.connector.loop.run_until_complete(replay(lcu, args.recording, args.speed, connection))
+
+    print(f"Replayed {count} events in {seconds:.3f}s ({count / max(seconds, 1e-9):.0f} events/s)")
+    stats = lcu.champ_select.stats()
+    print(f"Champ select: {stats['events']} events, {stats['coalesced']} coalesced, "
+          f"{stats['avg_cpu_us']:.0f} µs avg / {stats['max_cpu_us']:.0f} µs max CPU per event")
+    for name in (LatencyStats.READY_CHECK_ACCEPT, LatencyStats.LOCK_IN, LatencyStats.LCU_REQUEST):
+        snapshot = LatencyStats.histogram(name).snapshot()
+        if snapshot:
+            print(f"{name}: p50 {snapshot['p50']:.2f} ms, p99 {snapshot['p99']:.2f} ms, max {snapshot['max']:.2f} ms "
+                  f"({snapshot['count']} samples)")
+    for _, method, endpoint, data in connection.requests:
+        if method in WRITE_METHODS:
+            print(f"{method.upper()} {endpoint} {data}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
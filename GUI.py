@@ -1,21 +1,31 @@
 import json
-import requests
 import time
 from threading import Thread
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                              QWidget, QLabel, QPushButton, QCheckBox, QComboBox,
                              QScrollArea, QGridLayout, QFrame, QMessageBox, QLineEdit,
                              QTextEdit, QTabWidget, QSplitter, QStackedWidget, QSpacerItem,
-                             QSizePolicy)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QSize, QObject, QPropertyAnimation, QEasingCurve
-from PyQt5.QtGui import QPixmap, QFont, QPalette, QColor, QIcon, QPainter, QBrush, QLinearGradient
-from lcu_driver import Connector
+                             QSizePolicy, QSystemTrayIcon, QPlainTextEdit)
+from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QTimer, QSize, QObject, QPropertyAnimation, QEasingCurve,
+                          QConcatenateTablesProxyModel, QMimeData)
+from PyQt5.QtGui import (QPixmap, QFont, QPalette, QColor, QIcon, QPainter, QBrush, QLinearGradient,
+                         QStandardItemModel, QStandardItem, QDrag)
 import os
-import psutil
 import threading
 import time
 from LCUConnector import LCUConnector
 from ChampionDataFetcher import ChampionDataFetcher
+from IconCatalog import IconCatalog, ChampionFilterModel
+from ClientWatcher import ClientWatcher, find_lockfile, is_client_running
+from AccountManager import AccountManager, load_accounts
+from QtBridge import BusSignals
+from ConfigStore import get_config_store
+from NotificationDispatcher import get_dispatcher
+import EventLog
+import LatencyStats
+import ChampionCatalog
+import StartupProfile
+import Persistence
 import sys
 
 def resource_path(relative_path):
@@ -24,38 +34,12 @@ def resource_path(relative_path):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
 
-CACHE_FILE = resource_path("champion_cache.json")
 ICON_CACHE_DIR = resource_path("champion_icons")
 PICKS_FILE = resource_path("picks.txt")
 BANS_FILE = resource_path("bans.txt")
 PICKS_BANS_FILE = resource_path("picks_bans.json")
 ROLES = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "SUPPORT"]
-
-def load_cached_data():
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Failed to load cache: {e}")
-    return None
-
-def save_cached_data(data):
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-def download_icon(name, url):
-    os.makedirs(ICON_CACHE_DIR, exist_ok=True)
-    path = os.path.join(ICON_CACHE_DIR, f"{name}.png")
-    if not os.path.exists(path):
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                with open(path, "wb") as f:
-                    f.write(response.content)
-        except Exception as e:
-            print(f"Failed to download icon for {name}: {e}")
-    return path
+CHAMPION_MIME_TYPE = "application/x-queueassist-champion"
 
 
 class ModernCard(QFrame):
@@ -135,6 +119,44 @@ class ConnectionStatusWidget(QWidget):
         self.connection_text.style().polish(self.connection_text)
 
 
+class AccountStatusWidget(QWidget):
+    """Connection status of every account, plus the account whose picks and bans are being edited"""
+    account_selected = pyqtSignal(str)
+
+    def __init__(self, account_names):
+        super().__init__()
+        self.indicators = {}
+        self.init_ui(account_names)
+
+    def init_ui(self, account_names):
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+
+        for name in account_names:
+            indicator = StatusIndicator()
+            indicator.setToolTip(f"{name}: Disconnected")
+            label = QLabel(name)
+            label.setObjectName("statusLabel")
+            layout.addWidget(indicator)
+            layout.addWidget(label)
+            self.indicators[name] = indicator
+
+        self.account_combo = ModernComboBox()
+        self.account_combo.addItems(account_names)
+        self.account_combo.setToolTip("Account whose picks and bans are shown")
+        self.account_combo.currentTextChanged.connect(self.account_selected.emit)
+        layout.addWidget(self.account_combo)
+
+        self.setLayout(layout)
+
+    def update_status(self, name, connected):
+        indicator = self.indicators.get(name)
+        if indicator:
+            indicator.set_connected(connected)
+            indicator.setToolTip(f"{name}: {'Connected' if connected else 'Disconnected'}")
+
+
 class ModernToggle(QWidget):
     toggled = pyqtSignal(bool)
     
@@ -266,8 +288,9 @@ class AutomationControlWidget(QWidget):
 class NotificationsWidget(QWidget):
     notifications_updated = pyqtSignal(dict)
 
-    def __init__(self):
+    def __init__(self, config_store):
         super().__init__()
+        self.config_store = config_store
         self.init_ui()
         self.load_settings()
 
@@ -285,46 +308,114 @@ class NotificationsWidget(QWidget):
         self.setLayout(layout)
 
     def load_settings(self):
-        try:
-            if os.path.exists("config.json"):
-                with open("config.json", "r") as f:
-                    config = json.load(f)
-                    whatsapp_config = config.get("whatsapp_notifications", {})
-                    self.enable_notifications_toggle.setChecked(whatsapp_config.get("enabled", False))
-            else:
-                self.enable_notifications_toggle.setChecked(False)
-        except Exception as e:
-            print(f"Error loading notification settings: {e}")
+        whatsapp_config = self.config_store.get("whatsapp_notifications", {})
+        self.enable_notifications_toggle.setChecked(whatsapp_config.get("enabled", False))
 
     def save_settings(self):
-        config = {}
-        try:
-            if os.path.exists("config.json"):
-                with open("config.json", "r") as f:
-                    config = json.load(f)
-        except Exception as e:
-            print(f"Error reading config file: {e}")
-
-        whatsapp_config = config.get("whatsapp_notifications", {})
+        whatsapp_config = dict(self.config_store.get("whatsapp_notifications", {}))
         whatsapp_config["enabled"] = self.enable_notifications_toggle.isChecked()
-        config["whatsapp_notifications"] = whatsapp_config
+        # The connector picks the change up from the config store
+        self.config_store.set("whatsapp_notifications", whatsapp_config)
+        self.notifications_updated.emit(whatsapp_config)
+
+
+class DiagnosticsWidget(QWidget):
+    """Automation latency percentiles, refreshed from LatencyStats on a timer"""
+    REFRESH_MS = 1000
+    ROWS = [
+        (LatencyStats.READY_CHECK_ACCEPT, "Queue accept"),
+        (LatencyStats.LOCK_IN, "Lock-in"),
+        (LatencyStats.LCU_REQUEST, "LCU request"),
+        (LatencyStats.NOTIFICATION_DELIVERY, "Notification"),
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self.labels = {}
+        self.init_ui()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(self.REFRESH_MS)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setSpacing(20)
+
+        diagnostics_card = ModernCard("Diagnostics")
+        for name, title in self.ROWS:
+            label = QLabel()
+            label.setObjectName("diagnosticsLabel")
+            self.labels[name] = (label, title)
+            diagnostics_card.add_widget(label)
+
+        layout.addWidget(diagnostics_card)
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        for name, (label, title) in self.labels.items():
+            stats = LatencyStats.histogram(name).snapshot()
+            if stats is None:
+                label.setText(f"{title}: no samples")
+            else:
+                label.setText(f"{title}: p50 {stats['p50']:.0f} ms · p90 {stats['p90']:.0f} ms · "
+                              f"p99 {stats['p99']:.0f} ms ({stats['count']})")
+
 
-        try:
-            with open("config.json", "w") as f:
-                json.dump(config, f, indent=4)
-            if "whatsapp_notifications" in config:
-                self.notifications_updated.emit(config["whatsapp_notifications"])
-        except Exception as e:
-            print(f"Error saving notification settings: {e}")
+class EventLogWidget(QWidget):
+    """Recent events of the shared EventLog, appended in one batch per timer tick"""
+    FLUSH_MS = 250
+    MAX_LINES = 500
+
+    def __init__(self, event_log):
+        super().__init__()
+        self.event_log = event_log
+        self.last_seq = 0
+        self.init_ui()
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start(self.FLUSH_MS)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setSpacing(20)
+
+        activity_card = ModernCard("Activity")
+        self.text = QPlainTextEdit()
+        self.text.setObjectName("eventLogText")
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(self.MAX_LINES)
+        self.text.setFixedHeight(140)
+        activity_card.add_widget(self.text)
+
+        layout.addWidget(activity_card)
+        self.setLayout(layout)
+        self.flush()
+
+    @staticmethod
+    def format_event(event):
+        line = time.strftime("%H:%M:%S", time.localtime(event.time))
+        if event.source:
+            line += f" [{event.source}]"
+        if event.level != EventLog.INFO:
+            line += f" {event.level}:"
+        return f"{line} {event.message}"
+
+    def flush(self):
+        events = self.event_log.since(self.last_seq)
+        if not events:
+            return
+        self.last_seq = events[-1].seq
+        self.text.appendPlainText("\n".join(self.format_event(event) for event in events[-self.MAX_LINES:]))
 
 
 class ChampionItem(QWidget):
-    def __init__(self, champion_name, icon_path=None, index=1):
+    def __init__(self, champion_name, pixmap=None, index=1):
         super().__init__()
         self.champion_name = champion_name
-        self.icon_path = icon_path
+        self.pixmap = pixmap
         self.index = index
-        
+        self.drag_start = None
         
         self.init_ui()
         
@@ -334,41 +425,102 @@ class ChampionItem(QWidget):
         layout.setSpacing(10)
         
         # Index number
-        index_label = QLabel(f"{self.index}")
-        index_label.setObjectName("championIndex")
-        index_label.setFixedSize(20, 20)
-        index_label.setAlignment(Qt.AlignCenter)
-        
-        # Champion icon
-        icon_label = QLabel()
-        if self.icon_path and os.path.exists(self.icon_path):
-            pixmap = QPixmap(self.icon_path).scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            icon_label.setPixmap(pixmap)
-        else:
-            # Placeholder icon
-            icon_label.setFixedSize(32, 32)
-            icon_label.setStyleSheet("background: rgba(148, 163, 184, 0.3); border-radius: 16px;")
+        self.index_label = QLabel(f"{self.index}")
+        self.index_label.setObjectName("championIndex")
+        self.index_label.setFixedSize(20, 20)
+        self.index_label.setAlignment(Qt.AlignCenter)
+        
+        # Champion icon, styled as a placeholder circle until the icon is available
+        self.icon_label = QLabel()
+        self.icon_label.setObjectName("championIcon")
+        self.icon_label.setFixedSize(32, 32)
+        self.set_pixmap(self.pixmap)
         
         # Champion name
         name_label = QLabel(self.champion_name)
         name_label.setObjectName("championName")
         
-        layout.addWidget(index_label)
-        layout.addWidget(icon_label)
+        layout.addWidget(self.index_label)
+        layout.addWidget(self.icon_label)
         layout.addWidget(name_label)
         layout.addStretch()
         
         self.setLayout(layout)
 
+    def set_index(self, index):
+        if index != self.index:
+            self.index = index
+            self.index_label.setText(f"{index}")
+
+    def set_pixmap(self, pixmap):
+        self.pixmap = pixmap
+        if pixmap is not None:
+            self.icon_label.setPixmap(pixmap)
+        else:
+            self.icon_label.clear()
+        self.icon_label.setProperty("missing", pixmap is None)
+        self.icon_label.style().polish(self.icon_label)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.drag_start = event.pos()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if (self.drag_start is not None and event.buttons() & Qt.LeftButton
+                and (event.pos() - self.drag_start).manhattanLength() >= QApplication.startDragDistance()):
+            self.drag_start = None
+            mime_data = QMimeData()
+            mime_data.setData(CHAMPION_MIME_TYPE, self.champion_name.encode("utf-8"))
+            drag = QDrag(self)
+            drag.setMimeData(mime_data)
+            drag.setPixmap(self.grab())
+            drag.setHotSpot(event.pos())
+            drag.exec_(Qt.MoveAction)
+            return
+        super().mouseMoveEvent(event)
+
+
+class ChampionDropArea(QWidget):
+    """Container of a ChampionList's items that accepts drops to reorder them"""
+    champion_dropped = pyqtSignal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAcceptDrops(True)
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasFormat(CHAMPION_MIME_TYPE) and event.source() in self.children():
+            event.acceptProposedAction()
+
+    def dragMoveEvent(self, event):
+        self.dragEnterEvent(event)
+
+    def dropEvent(self, event):
+        name = bytes(event.mimeData().data(CHAMPION_MIME_TYPE)).decode("utf-8")
+        # Drop in front of the first item whose middle lies below the cursor
+        y = event.pos().y()
+        items = [child for child in self.children() if isinstance(child, ChampionItem) and child.isVisible()]
+        items.sort(key=lambda item: item.y())
+        position = len(items)
+        for i, item in enumerate(items):
+            if y < item.geometry().center().y():
+                position = i
+                break
+        event.acceptProposedAction()
+        self.champion_dropped.emit(name, position)
+
 
 class ChampionList(QWidget):
-    def __init__(self, title, placeholder_text):
+    def __init__(self, title, placeholder_text, icon_catalog):
         super().__init__()
         self.title = title
         self.placeholder_text = placeholder_text
         self.selected_champions = []
-        self.champion_icons = {}
+        self.icon_catalog = icon_catalog
+        self.items = {}
         self.on_clear = None  # Callback for clear event
+        self.on_reorder = None  # Callback for drag-and-drop reorder, receives the new order
         self.init_ui()
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
@@ -389,9 +541,15 @@ class ChampionList(QWidget):
         header_layout.addWidget(self.clear_btn)
         layout.addLayout(header_layout)
         
-        # Combo box
+        # Combo box: a placeholder row followed by this list's filtered view of the shared champion model
+        self.filter_model = ChampionFilterModel(self.icon_catalog.model, self)
+        placeholder_model = QStandardItemModel(self)
+        placeholder_model.appendRow(QStandardItem(self.placeholder_text))
+        combo_model = QConcatenateTablesProxyModel(self)
+        combo_model.addSourceModel(placeholder_model)
+        combo_model.addSourceModel(self.filter_model)
         self.combo = ModernComboBox()
-        self.combo.addItem(self.placeholder_text)
+        self.combo.setModel(combo_model)
         layout.addWidget(self.combo)
         
         scroll_area = QScrollArea()
@@ -402,7 +560,8 @@ class ChampionList(QWidget):
         scroll_area.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         scroll_area.setMinimumHeight(200)  
         
-        self.list_widget = QWidget()
+        self.list_widget = ChampionDropArea()
+        self.list_widget.champion_dropped.connect(self.handle_drop)
        
         self.list_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Maximum)
         
@@ -415,6 +574,7 @@ class ChampionList(QWidget):
         self.placeholder_label.setObjectName("placeholderText")
         self.placeholder_label.setAlignment(Qt.AlignCenter)
         self.list_layout.addWidget(self.placeholder_label)
+        self.list_layout.addStretch()
         
         scroll_area.setWidget(self.list_widget)
         
@@ -428,52 +588,66 @@ class ChampionList(QWidget):
         else:
             self.clear_list()
 
-    def set_champion_icons(self, champion_icons):
-        self.champion_icons = champion_icons
-        self.update_display()
         
     def clear_list(self):
         self.selected_champions.clear()
         self.update_display()
         
+    def handle_drop(self, champion_name, position):
+        if champion_name not in self.selected_champions:
+            return
+        order = [name for name in self.selected_champions if name != champion_name]
+        if position > self.selected_champions.index(champion_name):
+            position -= 1
+        order.insert(position, champion_name)
+        if order == self.selected_champions:
+            return
+        if self.on_reorder:
+            self.on_reorder(order)
+        else:
+            self.selected_champions = order
+            self.update_display()
+
     def update_display(self):
-        # Clear existing items
-        for i in reversed(range(self.list_layout.count())):
-            child = self.list_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        
-        if self.selected_champions:
-            self.placeholder_label.hide()
-            for i, champion in enumerate(self.selected_champions):
-                icon_path = None
-                if champion in self.champion_icons:
-                    # Get the icon path from the champion icons
-                    icon_path = os.path.join(ICON_CACHE_DIR, f"{champion}.png")
-                
-                champion_item = ChampionItem(champion, icon_path, i + 1)
+        # Champions already in the list are hidden from the combo box
+        self.filter_model.set_excluded(self.selected_champions)
+
+        # Drop the items that left the list, existing ones are reused as they are
+        for champion in [name for name in self.items if name not in self.selected_champions]:
+            champion_item = self.items.pop(champion)
+            self.list_layout.removeWidget(champion_item)
+            champion_item.deleteLater()
+
+        # Layout slot 0 is the placeholder label, items follow in priority order
+        for i, champion in enumerate(self.selected_champions):
+            champion_item = self.items.get(champion)
+            if champion_item is None:
+                champion_item = ChampionItem(champion, self.icon_catalog.pixmap(champion, 32), i + 1)
                 champion_item.setObjectName("championItem")
-                self.list_layout.addWidget(champion_item)
-            
-            # Add stretch at the end
-            self.list_layout.addStretch()
-        else:
-            self.placeholder_label.setText(f"No {self.title.lower()} selected")
-            self.list_layout.addWidget(self.placeholder_label)
-            self.placeholder_label.show()
+                self.items[champion] = champion_item
+                self.list_layout.insertWidget(i + 1, champion_item)
+            else:
+                if self.list_layout.indexOf(champion_item) != i + 1:
+                    self.list_layout.removeWidget(champion_item)
+                    self.list_layout.insertWidget(i + 1, champion_item)
+                champion_item.set_index(i + 1)
+                pixmap = self.icon_catalog.pixmap(champion, 32)
+                if pixmap is not champion_item.pixmap:
+                    champion_item.set_pixmap(pixmap)
+
+        self.placeholder_label.setVisible(not self.selected_champions)
 
 
 class ChampionSelectWidget(QWidget):
-    picks_bans_updated = pyqtSignal(dict)
-    
-    def __init__(self):
+    def __init__(self, role, icon_catalog, picks_bans_store, config_store):
         super().__init__()
-        self.champions_data = {}
-        self.champion_icons = {}
-        self.selected_role = "TOP"
-        self.picks_bans = {role: {"picks": [], "bans": []} for role in ROLES}
+        self.icon_catalog = icon_catalog
+        self.config_store = config_store
+        self.catalog = None
+        self.selected_role = role
+        self.picks_bans_store = picks_bans_store
         self.init_ui()
-        QTimer.singleShot(0, self.load_saved_data)
+        QTimer.singleShot(0, self.update_displays)
         
     def init_ui(self):
         layout = QVBoxLayout()
@@ -484,15 +658,17 @@ class ChampionSelectWidget(QWidget):
         card.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         columns_layout = QHBoxLayout()
         columns_layout.setSpacing(30)
-        self.picks_widget = ChampionList("Priority Picks", "Select champion to pick...")
+        self.picks_widget = ChampionList("Priority Picks", "Select champion to pick...", self.icon_catalog)
         self.picks_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.picks_widget.combo.currentTextChanged.connect(self.on_pick_selected)
         self.picks_widget.on_clear = self.on_clear_picks
+        self.picks_widget.on_reorder = self.on_reorder_picks
         columns_layout.addWidget(self.picks_widget, 1)
-        self.bans_widget = ChampionList("Priority Bans", "Select champion to ban...")
+        self.bans_widget = ChampionList("Priority Bans", "Select champion to ban...", self.icon_catalog)
         self.bans_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.bans_widget.combo.currentTextChanged.connect(self.on_ban_selected)
         self.bans_widget.on_clear = self.on_clear_bans
+        self.bans_widget.on_reorder = self.on_reorder_bans
         columns_layout.addWidget(self.bans_widget, 1)
         card.content_layout.addLayout(columns_layout, 1)
         layout.addWidget(card, 1)
@@ -503,207 +679,197 @@ class ChampionSelectWidget(QWidget):
         self.update_displays()
         self.save_last_role()
 
-    def load_saved_data(self):
-        try:
-            if os.path.exists(PICKS_BANS_FILE):
-                with open(PICKS_BANS_FILE, "r", encoding="utf-8") as f:
-                    loaded_data = json.load(f)
-                
-                needs_saving = False
-                if "UTILITY" in loaded_data and "SUPPORT" not in loaded_data:
-                    loaded_data["SUPPORT"] = loaded_data.pop("UTILITY")
-                    needs_saving = True
-                
-                self.picks_bans = loaded_data
-                
-                if needs_saving:
-                    self.save_all_roles()
-            else:
-                # Migrate from old files if present
-                picks, bans = [], []
-                if os.path.exists("picks.txt"):
-                    with open("picks.txt", "r", encoding="utf-8") as f:
-                        picks = [line.strip() for line in f.readlines() if line.strip()]
-                if os.path.exists("bans.txt"):
-                    with open("bans.txt", "r", encoding="utf-8") as f:
-                        bans = [line.strip() for line in f.readlines() if line.strip()]
-                for role in ROLES:
-                    self.picks_bans[role]["picks"] = picks.copy()
-                    self.picks_bans[role]["bans"] = bans.copy()
-                self.save_all_roles()
-            self.update_displays()
-            self.picks_bans_updated.emit(self.picks_bans)
-        except Exception as e:
-            print(f"Error loading saved data: {e}")
+    def set_picks_bans_store(self, picks_bans_store):
+        """Switch to another account's picks and bans"""
+        self.picks_bans_store = picks_bans_store
+        self.update_displays()
 
     def save_last_role(self):
-        config = {}
-        try:
-            if os.path.exists("config.json"):
-                with open("config.json", "r") as f:
-                    config = json.load(f)
-        except Exception as e:
-            print(f"Error reading config file: {e}")
-
-        config["last_selected_role"] = self.selected_role
-
-        try:
-            with open("config.json", "w") as f:
-                json.dump(config, f, indent=4)
-        except Exception as e:
-            print(f"Error saving last role: {e}")
-
-    def save_all_roles(self):
-        try:
-            with open(PICKS_BANS_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.picks_bans, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Error writing to {PICKS_BANS_FILE}: {e}")
+        self.config_store.set("last_selected_role", self.selected_role)
 
     def update_displays(self):
-        picks = self.picks_bans[self.selected_role]["picks"]
-        bans = self.picks_bans[self.selected_role]["bans"]
-        self.picks_widget.selected_champions = picks.copy()
-        self.bans_widget.selected_champions = bans.copy()
+        lists = self.picks_bans_store.lists(self.selected_role)
+        self.picks_widget.selected_champions = list(lists["picks"])
+        self.bans_widget.selected_champions = list(lists["bans"])
         self.picks_widget.update_display()
         self.bans_widget.update_display()
 
+    def set_list(self, kind, names):
+        # The store notifies the connector and saves the file in the background
+        self.picks_bans_store.set(self.selected_role, kind, names)
+        self.update_displays()
+
     def on_pick_selected(self, champion_name):
         if champion_name and not champion_name.startswith("Select champion"):
-            picks = self.picks_bans[self.selected_role]["picks"]
-            if champion_name not in picks:
-                picks.append(champion_name)
-                self.save_all_roles()
-                self.update_displays()
-                self.picks_bans_updated.emit(self.picks_bans)
+            # Reset first, the champion is about to be filtered out of the combo box
             self.picks_widget.combo.setCurrentIndex(0)
+            picks = self.picks_bans_store.lists(self.selected_role)["picks"]
+            if champion_name not in picks:
+                self.set_list("picks", picks + [champion_name])
 
     def on_ban_selected(self, champion_name):
         if champion_name and not champion_name.startswith("Select champion"):
-            bans = self.picks_bans[self.selected_role]["bans"]
-            if champion_name not in bans:
-                bans.append(champion_name)
-                self.save_all_roles()
-                self.update_displays()
-                self.picks_bans_updated.emit(self.picks_bans)
+            # Reset first, the champion is about to be filtered out of the combo box
             self.bans_widget.combo.setCurrentIndex(0)
+            bans = self.picks_bans_store.lists(self.selected_role)["bans"]
+            if champion_name not in bans:
+                self.set_list("bans", bans + [champion_name])
 
-    def update_champions_data(self, champions_data):
-        self.champions_data = champions_data
-        self.download_champion_icons()
-        self.populate_comboboxes()
-        self.picks_widget.set_champion_icons(self.champion_icons)
-        self.bans_widget.set_champion_icons(self.champion_icons)
-
-    def download_champion_icons(self):
-        for name, data in self.champions_data.items():
-            path = download_icon(name, data['image_url'])
-            if os.path.exists(path):
-                pixmap = QPixmap(path).scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.champion_icons[name] = pixmap
-                
-    def populate_comboboxes(self):
-        champion_names = sorted(list(self.champions_data.keys()))
-        
-        self.picks_widget.combo.clear()
-        self.picks_widget.combo.addItem("Select champion to pick...")
-        for name in champion_names:
-            icon_path = os.path.join(ICON_CACHE_DIR, f"{name}.png")
-            if os.path.exists(icon_path):
-                icon = QIcon(QPixmap(icon_path).scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                self.picks_widget.combo.addItem(icon, name)
-            else:
-                self.picks_widget.combo.addItem(name)
-        
-        self.bans_widget.combo.clear()
-        self.bans_widget.combo.addItem("Select champion to ban...")
-        for name in champion_names:
-            icon_path = os.path.join(ICON_CACHE_DIR, f"{name}.png")
-            if os.path.exists(icon_path):
-                icon = QIcon(QPixmap(icon_path).scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                self.bans_widget.combo.addItem(icon, name)
-            else:
-                self.bans_widget.combo.addItem(name)
+    def update_catalog(self, catalog):
+        # The combo boxes view the shared champion model, which the icon catalog already updated
+        self.catalog = catalog
+        self.update_displays()
 
     def on_clear_picks(self):
-        self.picks_bans[self.selected_role]["picks"] = []
-        self.save_all_roles()
-        self.update_displays()
-        self.picks_bans_updated.emit(self.picks_bans)
+        self.set_list("picks", [])
 
     def on_clear_bans(self):
-        self.picks_bans[self.selected_role]["bans"] = []
-        self.save_all_roles()
-        self.update_displays()
-        self.picks_bans_updated.emit(self.picks_bans)
+        self.set_list("bans", [])
+
+    def on_reorder_picks(self, picks):
+        self.set_list("picks", picks)
+
+    def on_reorder_bans(self, bans):
+        self.set_list("bans", bans)
 
 
 class InitializationManager(QObject):
     status_updated = pyqtSignal(str)
     initialization_finished = pyqtSignal()
 
-    def __init__(self, lcu_connector, champion_fetcher):
+    def __init__(self, champion_fetcher):
         super().__init__()
-        self.lcu_connector = lcu_connector
         self.champion_fetcher = champion_fetcher
-        self.tasks_finished = threading.Event()
 
     def run(self):
         thread = Thread(target=self._run_all, daemon=True)
         thread.start()
 
     def _run_all(self):
-        champion_thread = Thread(target=self._init_champions, daemon=True)
-        notification_thread = Thread(target=self._init_notifications, daemon=True)
-
-        champion_thread.start()
-        notification_thread.start()
-
-        champion_thread.join()
-        notification_thread.join()
-
-        self.initialization_finished.emit()
-
-    def _init_champions(self):
+        # Notifications need no setup: the dispatcher reads config.json when it first sends
         self.status_updated.emit("Initializing champions...")
         self.champion_fetcher.run()
-
-    def _init_notifications(self):
-        self.status_updated.emit("Initializing notification system...")
-        self.lcu_connector.init_notification_system()
+        self.initialization_finished.emit()
 
 
 class LeagueAssistantApp(QMainWindow):
+    client_running_changed = pyqtSignal(bool)
+    picks_bans_changed = pyqtSignal(str)
+    config_changed = pyqtSignal(list)
+    desktop_notification = pyqtSignal(str, str)
+    CONNECT_FALLBACK_MS = 1000
+
     def __init__(self):
         super().__init__()
-        self.lcu_connector = LCUConnector()
-        self.champion_fetcher = ChampionDataFetcher()
+        self.config_store = get_config_store()
+        self.config_store.watch()
+
+        # With accounts listed in config.json every client gets its own connector on one shared loop
+        accounts = load_accounts(self.config_store)
+        self.account_manager = AccountManager(accounts) if accounts else None
+        if self.account_manager:
+            self.lcu_connector = self.account_manager.connectors[accounts[0].name]
+        else:
+            self.lcu_connector = LCUConnector()
+        self.controller = self.account_manager or self.lcu_connector
+        # The connectors publish on their loop thread; these signals bring the events to the GUI thread
+        self.bus_signals = BusSignals(self.controller.bus, self)
+        # The champion cache is read once here; the fetcher only checks it against the latest patch
+        cache = ChampionCatalog.load_cache()
+        self.champion_fetcher = ChampionDataFetcher(cache=cache)
+        self.icon_catalog = IconCatalog()
         self.init_ui()
         self.apply_modern_styles()
         self.setup_connections()
+        self.setup_tray_icon()
+        StartupProfile.mark("UI built")
+        if cache:
+            self.on_champion_data_received(cache)
+            self.status_label.setText(f"Ready - Loaded {len(cache)} champions (cached)")
+        StartupProfile.mark("champions loaded")
         self.start_initialization()
         
         
-        # Start LCU connector
-        self.lcu_connector.start_connector()
-        
-        # Monitor League client
-        self.league_monitor_thread = threading.Thread(target=self.monitor_league_process, daemon=True)
-        self.league_monitor_thread.start()
+        self.client_running_changed.connect(self.on_client_running_changed)
+        self.client_watcher = None
+        self.painted = False
+        self.connection_started = False
+        # Connecting imports lcu_driver and aiohttp, so it waits for the first paint; the timer covers
+        # a window that starts hidden or minimized
+        QTimer.singleShot(self.CONNECT_FALLBACK_MS, self.start_connection)
 
-    def monitor_league_process(self):
-        while True:
-            if not self.is_league_running():
-                print("League of Legends client closed. Exiting application...")
-                QTimer.singleShot(0, self.close)
-                break
-            time.sleep(5)
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.painted:
+            self.painted = True
+            StartupProfile.mark("first paint")
+            QTimer.singleShot(0, self.start_connection)
+
+    def start_connection(self):
+        if self.connection_started:
+            return
+        self.connection_started = True
+        # Watch the client through its lockfile and re-attach when it restarts instead of exiting
+        lockfile = None if self.account_manager else find_lockfile()
+        if self.account_manager:
+            self.account_manager.start()
+        elif lockfile:
+            self.lcu_connector.start_connector(use_lockfile=True)
+            self.client_watcher = ClientWatcher(lockfile, on_started=self.on_client_started,
+                                                on_stopped=lambda: self.client_running_changed.emit(False))
+            self.client_watcher.start()
+        else:
+            self.lcu_connector.start_connector()
+        StartupProfile.mark("connector started")
+
+    def setup_tray_icon(self):
+        # Desktop notifications are sent from the dispatcher thread and shown on the GUI thread
+        self.tray_icon = None
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray_icon = QSystemTrayIcon(self.windowIcon(), self)
+            self.tray_icon.show()
+            self.desktop_notification.connect(self.show_desktop_notification)
+            get_dispatcher().set_desktop_handler(self.desktop_notification.emit)
+
+    def show_desktop_notification(self, title, message):
+        self.tray_icon.showMessage(title, message)
+
+    def on_client_started(self, lockfile_info):
+        # Called on the watcher thread; attach() hands over to the connector's event loop
+        self.lcu_connector.attach(lockfile_info)
+        self.client_running_changed.emit(True)
+
+    def on_client_running_changed(self, running):
+        if running:
+            self.status_label.setText("League client found, connecting...")
+        else:
+            self.status_label.setText("League client closed, waiting for it to restart...")
+
+    def connectors(self):
+        return list(self.account_manager.connectors.values()) if self.account_manager else [self.lcu_connector]
+
+    def on_connector_state_changed(self, name):
+        # Follow changes made through the control API; setChecked does not emit toggled.
+        # The toggles show the selected account only, the bus carries every account's changes.
+        if name != (self.lcu_connector.name or ""):
+            return
+        self.automation_widget.auto_accept_toggle.setChecked(self.lcu_connector.auto_accept_enabled)
+        self.automation_widget.auto_select_toggle.setChecked(self.lcu_connector.auto_select_enabled)
+
+    def on_account_selected(self, name):
+        self.lcu_connector = self.account_manager.connectors[name]
+        for widget in self.champion_select_widgets.values():
+            widget.set_picks_bans_store(self.lcu_connector.picks_bans_store)
+        self.on_connector_state_changed(name)
 
     @staticmethod
     def is_league_running():
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'] == 'LeagueClientUx.exe':
-                return True
+        accounts = load_accounts(get_config_store())
+        if accounts:
+            return any(is_client_running(account.lockfile) for account in accounts)
+        lockfile = find_lockfile()
+        if lockfile:
+            return is_client_running(lockfile)
         return False
 
     def init_ui(self):
@@ -727,7 +893,10 @@ class LeagueAssistantApp(QMainWindow):
         title_label = QLabel("League Queue Assist")
         title_label.setObjectName("appTitle")
         
-        self.connection_widget = ConnectionStatusWidget()
+        if self.account_manager:
+            self.connection_widget = AccountStatusWidget(list(self.account_manager.connectors))
+        else:
+            self.connection_widget = ConnectionStatusWidget()
         
         header_layout.addWidget(title_label)
         header_layout.addStretch()
@@ -750,19 +919,28 @@ class LeagueAssistantApp(QMainWindow):
         self.automation_widget = AutomationControlWidget()
         sidebar_layout.addWidget(self.automation_widget)
 
-        self.notifications_widget = NotificationsWidget()
+        self.notifications_widget = NotificationsWidget(self.config_store)
         sidebar_layout.addWidget(self.notifications_widget)
+
+        self.diagnostics_widget = DiagnosticsWidget()
+        sidebar_layout.addWidget(self.diagnostics_widget)
+
+        self.event_log_widget = EventLogWidget(EventLog.get_event_log())
+        sidebar_layout.addWidget(self.event_log_widget)
         sidebar_layout.addStretch()
         
         # Right main area - Champion selection tabs
         self.tabs = QTabWidget()
         self.tabs.setObjectName("roleTabs")
-        self.champion_select_widgets = []
+        self.champion_select_widgets = {}
+        self.catalog = None
 
+        # Tabs start as empty pages, the role widget is built the first time its tab is shown
         for role in ROLES:
-            champion_select_widget = ChampionSelectWidget()
-            self.tabs.addTab(champion_select_widget, role)
-            self.champion_select_widgets.append(champion_select_widget)
+            page = QWidget()
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(page, role)
         
         content_layout.addWidget(sidebar)
         content_layout.addWidget(self.tabs, 1)
@@ -833,6 +1011,18 @@ class LeagueAssistantApp(QMainWindow):
                 color: #F8FAFC;
             }
             
+            #diagnosticsLabel {
+                font-size: 12px;
+                color: #94A3B8;
+            }
+
+            #eventLogText {
+                font-size: 11px;
+                color: #94A3B8;
+                background: transparent;
+                border: none;
+            }
+            
             #modernToggleWidget {
                 background: transparent;
                 padding: 8px 0px;
@@ -891,6 +1081,11 @@ class LeagueAssistantApp(QMainWindow):
                 font-weight: 600;
             }
             
+            #championIcon[missing="true"] {
+                background: rgba(148, 163, 184, 0.3);
+                border-radius: 16px;
+            }
+            
             #championName {
                 font-size: 13px;
                 color: #F8FAFC;
@@ -1027,45 +1222,95 @@ class LeagueAssistantApp(QMainWindow):
         
     def setup_connections(self):
         """Setup signal connections between components"""
-        # LCU connector signals
-        self.lcu_connector.status_changed.connect(self.connection_widget.update_status)
+        # LCU connector events
+        if self.account_manager:
+            self.bus_signals.status_changed.connect(self.connection_widget.update_status)
+            self.connection_widget.account_selected.connect(self.on_account_selected)
+        else:
+            self.bus_signals.status_changed.connect(lambda name, connected: self.connection_widget.update_status(connected))
         
-        # Automation control signals
-        self.automation_widget.auto_accept_changed.connect(self.lcu_connector.set_auto_accept)
-        self.automation_widget.auto_select_changed.connect(self.lcu_connector.set_auto_select)
+        # Automation control signals, for every account in multi-account mode
+        self.automation_widget.auto_accept_changed.connect(self.controller.set_auto_accept)
+        self.automation_widget.auto_select_changed.connect(self.controller.set_auto_select)
+        self.bus_signals.state_changed.connect(self.on_connector_state_changed)
         
-        # Champion select signals
-        for widget in self.champion_select_widgets:
-            widget.picks_bans_updated.connect(self.lcu_connector.update_picks_and_bans)
-        self.notifications_widget.notifications_updated.connect(self.lcu_connector.update_notifications_config)
+        # External edits of config.json, reported on the watcher thread
+        self.config_changed.connect(self.on_config_changed)
+        self.config_listener = lambda keys: self.config_changed.emit(sorted(keys))
+        self.config_store.add_listener(self.config_listener)
         
+        # Picks and bans can also change outside the tabs, the store listener may run on any thread
+        self.picks_bans_changed.connect(self.on_picks_bans_changed)
+        self.picks_bans_listener = lambda role: self.picks_bans_changed.emit(role or "")
+        for connector in self.connectors():
+            connector.picks_bans_store.add_listener(self.picks_bans_listener)
+
         # Tab logic
         self.tabs.currentChanged.connect(self.on_tab_changed)
+        self.role_widget(self.tabs.currentIndex())
+
+    def role_widget(self, index):
+        """Return the ChampionSelectWidget of a tab, building it the first time the tab is shown"""
+        role = self.tabs.tabText(index)
+        champion_select_widget = self.champion_select_widgets.get(role)
+        if champion_select_widget is None:
+            champion_select_widget = ChampionSelectWidget(role, self.icon_catalog, self.lcu_connector.picks_bans_store,
+                                                          self.config_store)
+            self.tabs.widget(index).layout().addWidget(champion_select_widget)
+            self.champion_select_widgets[role] = champion_select_widget
+            if self.catalog:
+                champion_select_widget.update_catalog(self.catalog)
+        return champion_select_widget
+
+    def on_config_changed(self, keys):
+        if "whatsapp_notifications" in keys:
+            self.notifications_widget.load_settings()
+
+    def on_picks_bans_changed(self, role):
+        for widget in self.champion_select_widgets.values():
+            widget.update_displays()
 
     def on_tab_changed(self, index):
-        champion_select_widget = self.tabs.widget(index)
-        if champion_select_widget:
-            role = self.tabs.tabText(index)
-            champion_select_widget.on_role_changed(role)
+        if index < 0:
+            return
+        champion_select_widget = self.role_widget(index)
+        champion_select_widget.on_role_changed(self.tabs.tabText(index))
 
     def start_initialization(self):
-        self.init_manager = InitializationManager(self.lcu_connector, self.champion_fetcher)
+        self.init_manager = InitializationManager(self.champion_fetcher)
         self.init_manager.status_updated.connect(self.status_label.setText)
         self.init_manager.initialization_finished.connect(self.on_initialization_finished)
         
         self.champion_fetcher.data_fetched.connect(self.on_champion_data_received)
         self.champion_fetcher.error_occurred.connect(self.on_champion_data_error)
+        self.champion_fetcher.icon_progress.connect(self.on_icon_progress)
+        self.champion_fetcher.icons_ready.connect(self.on_icons_ready)
+        self.champion_fetcher.version_changed.connect(self.on_champion_version_changed)
         
         self.init_manager.run()
 
-    def on_champion_data_received(self, champions_data):
-        for widget in self.champion_select_widgets:
-            widget.update_champions_data(champions_data)
+    def on_champion_data_received(self, catalog):
+        self.catalog = catalog
+        ChampionCatalog.set_catalog(catalog)
+        self.icon_catalog.set_champions(catalog)
+        for widget in self.champion_select_widgets.values():
+            widget.update_catalog(catalog)
         
-        # Set initial role for the first tab
-        if self.champion_select_widgets:
-            self.on_tab_changed(self.tabs.currentIndex())
+        # Set initial role for the current tab
+        self.on_tab_changed(self.tabs.currentIndex())
         
+    def on_icon_progress(self, done, total):
+        self.status_label.setText(f"Downloading champion icons... {done}/{total}")
+
+    def on_icons_ready(self):
+        # Drop cached misses so the freshly downloaded icons get picked up
+        self.icon_catalog.invalidate()
+        for widget in self.champion_select_widgets.values():
+            widget.update_catalog(self.catalog)
+
+    def on_champion_version_changed(self, version):
+        self.status_label.setText(f"Champion data updated to patch {version}")
+
     def on_initialization_finished(self):
         self.status_label.setText("Ready")
 
@@ -1075,10 +1320,25 @@ class LeagueAssistantApp(QMainWindow):
         
     def closeEvent(self, event):
         """Handle application close"""
-        try:
-            self.lcu_connector.connector.stop()
-        except:
-            pass
+        self.champion_fetcher.stop()
+        if self.client_watcher:
+            self.client_watcher.stop()
+        self.controller.stop_recording()
+        # The stores are shared and outlive the window
+        self.config_store.remove_listener(self.config_listener)
+        for connector in self.connectors():
+            connector.picks_bans_store.remove_listener(self.picks_bans_listener)
+        Persistence.flush_all()
+        self.config_store.stop()
+        get_dispatcher().stop()
+        EventLog.get_event_log().close_file()
+        if self.account_manager:
+            self.account_manager.stop()
+        else:
+            try:
+                self.lcu_connector.stop_connector()
+            except:
+                pass
         event.accept()
 
 
@@ -1087,4 +1347,4 @@ if __name__ == "__main__":
     app.setFont(QFont("Century Gothic"))
     window = LeagueAssistantApp()
     window.show()
-    app.exec_()
\ No newline at end of file
+    app.exec_()
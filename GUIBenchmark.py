@@ -0,0 +1,283 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gui_benchmark_baseline.json")
+TOLERANCE = 0.5
+# Differences below this are timer noise, whatever the ratio
+MIN_REGRESSION_MS = 0.5
+# Measurements with fewer samples are reported but never fail the run
+MIN_GATED_SAMPLES = 5
+CALIBRATION_RUNS = 10
+# Full passes: a baseline is their median, a check measures again while something is over the baseline
+RUNS = 3
+LIST_SIZES = (1, 10, 50)
+
+
+def synthetic_catalog(count):
+    from ChampionCatalog import Champion, ChampionCatalog
+    return ChampionCatalog("0.0.1", [Champion(i, f"Champion{i}", f"Champion {i:03d}", "the Benchmark", f"Champion{i}.png")
+                                     for i in range(1, count + 1)])
+
+
+def write_fixtures(directory, catalog):
+    """Champion catalog and picks/bans in directory, which becomes the working directory"""
+    from Persistence import ROLES, write_json_atomic
+    catalog.save(os.path.join(directory, "champion_catalog.json"))
+    names = [champion.name for champion in catalog]
+    write_json_atomic(os.path.join(directory, "picks_bans.json"),
+                      {role: {"picks": names[i * 5:i * 5 + 5], "bans": names[-i * 5 - 5:len(names) - i * 5]}
+                       for i, role in enumerate(ROLES)})
+
+
+def summarize(samples, calibration):
+    samples = sorted(samples)
+    return {
+        "median": statistics.median(samples),
+        "p90": samples[min(len(samples) - 1, int(len(samples) * 0.9))],
+        "min": samples[0],
+        "samples": len(samples),
+        "calibration": calibration,
+        # The fastest sample is the one least disturbed by the rest of the machine
+        "relative": samples[0] / calibration,
+    }
+
+
+def calibrate():
+    """Best time in ms of a fixed Python and Qt workload, the unit measurements are compared in.
+
+    It runs right before each measurement, so a machine that is slower or busier than the one that
+    recorded the baseline slows both alike.
+    """
+    from PyQt5.QtWidgets import QLabel
+    best = float("inf")
+    for _ in range(CALIBRATION_RUNS):
+        start = time.perf_counter()
+        labels = [QLabel(f"Calibration {i}") for i in range(100)]
+        for label in labels:
+            label.setStyleSheet("color: #c89b3c; padding: 2px;")
+            label.sizeHint()
+        sum(i * i for i in range(20000))
+        best = min(best, time.perf_counter() - start)
+        del labels
+    return best * 1000
+
+
+def run(args, app):
+    """One pass over every measurement; returns (environment, results)"""
+    from PyQt5.QtCore import QT_VERSION_STR, QEvent
+    from GUI import LeagueAssistantApp
+
+    class BenchmarkApp(LeagueAssistantApp):
+        """The real window without the Data Dragon fetch and the client connection"""
+
+        def start_initialization(self):
+            pass
+
+        def start_connection(self):
+            self.connection_started = True
+
+    catalog = synthetic_catalog(args.champions)
+    results = {}
+
+    def flush():
+        # processEvents() never delivers DeferredDelete, so widgets removed with deleteLater() would
+        # pile up for the whole run and slow down every later measurement
+        app.processEvents()
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    def measure(name, action, repeat, setup=None):
+        calibration = calibrate()
+        samples = []
+        for _ in range(repeat):
+            if setup:
+                setup()
+                flush()
+            start = time.perf_counter()
+            action()
+            # Include the layout and paint work Qt defers to the event loop
+            flush()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = summarize(samples, calibration)
+
+    windows = []
+
+    def construct():
+        windows.append(BenchmarkApp())
+
+    def first_paint():
+        window = windows[-1]
+        window.show()
+        while not window.painted:
+            app.processEvents()
+
+    def close_windows():
+        while windows:
+            window = windows.pop()
+            window.close()
+            window.deleteLater()
+        flush()
+
+    def new_window():
+        close_windows()
+        construct()
+
+    measure("construct LeagueAssistantApp", construct, args.construct_repeat, setup=close_windows)
+    measure("show until first paint", first_paint, args.construct_repeat, setup=new_window)
+
+    # First visits build the role widget, later visits only switch. Every window has one first
+    # visit per tab, so take them from several.
+    calibration = calibrate()
+    first_visits = []
+    for _ in range(args.construct_repeat):
+        new_window()
+        first_paint()
+        tabs = windows[-1].tabs
+        for index in range(1, tabs.count()):
+            start = time.perf_counter()
+            tabs.setCurrentIndex(index)
+            flush()
+            first_visits.append((time.perf_counter() - start) * 1000)
+    results["tab switch, first visit"] = summarize(first_visits, calibration)
+    window = windows[-1]
+    next_tab = iter(range(10 ** 6))
+    measure("tab switch via on_tab_changed", lambda: window.on_tab_changed(next(next_tab) % tabs.count()), args.repeat)
+
+    empty = synthetic_catalog(0)
+    measure("champion model population", lambda: window.icon_catalog.set_champions(catalog), args.repeat,
+            setup=lambda: window.icon_catalog.set_champions(empty))
+
+    champion_list = window.role_widget(tabs.currentIndex()).picks_widget
+    names = [champion.name for champion in catalog]
+
+    def fill(count):
+        champion_list.selected_champions = names[:count]
+        champion_list.update_display()
+
+    def clear():
+        champion_list.selected_champions = []
+        champion_list.update_display()
+
+    def reverse():
+        champion_list.selected_champions = champion_list.selected_champions[::-1]
+        champion_list.update_display()
+
+    for count in LIST_SIZES:
+        measure(f"ChampionList.update_display, {count} added", lambda: fill(count), args.repeat, setup=clear)
+        if count > 1:
+            fill(count)
+            measure(f"ChampionList.update_display, {count} reordered", reverse, args.repeat)
+
+    # Restyles every widget built so far, so it is slow enough to need fewer samples
+    measure("apply_modern_styles", window.apply_modern_styles, args.construct_repeat)
+    close_windows()
+    environment = {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "champions": args.champions,
+    }
+    return environment, results
+
+
+def regressed(stats, base, tolerance):
+    if base is None or stats["samples"] < MIN_GATED_SAMPLES:
+        return False
+    return stats["relative"] > base * (1 + tolerance) and stats["min"] - base * stats["calibration"] > MIN_REGRESSION_MS
+
+
+def compare(results, baseline, tolerance):
+    """Print every measurement against its baseline; return the names that regressed.
+
+    The fastest sample is compared, in multiples of the calibration workload. The baseline is shown
+    converted back to milliseconds at this run's calibration.
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        line = (f"{name:<45} {stats['min']:9.2f} ms  (median {stats['median']:.2f}, p90 {stats['p90']:.2f}, "
+                f"n={stats['samples']})")
+        if base is not None:
+            line += f"  baseline {base * stats['calibration']:.2f} ms"
+            if stats["samples"] < MIN_GATED_SAMPLES:
+                line += "  (not gated)"
+            elif regressed(stats, base, tolerance):
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offscreen benchmarks of the main window. Compares with the "
+                                                 "stored baseline and exits with status 1 on a regression")
+    parser.add_argument("--champions", type=int, default=170, help="size of the synthetic champion catalog")
+    parser.add_argument("--repeat", type=int, default=30, help="samples per measurement")
+    parser.add_argument("--construct-repeat", type=int, default=7,
+                        help="samples of the slow measurements: window construction and stylesheets")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slowdown of the fastest sample over its baseline, 0.5 = 50%%")
+    parser.add_argument("--runs", type=int, default=RUNS,
+                        help="passes for a baseline (their median is stored), and at most for a check: a measurement "
+                             "only regresses if it is over the baseline in every pass")
+    parser.add_argument("--update-baseline", action="store_true", help="store the median of --runs passes as the new baseline")
+    args = parser.parse_args()
+    baseline_path = os.path.abspath(args.baseline)
+
+    # Run against fixtures in a scratch directory, never the user's config.json and picks
+    directory = tempfile.mkdtemp(prefix="gui_benchmark_")
+    os.chdir(directory)
+    write_fixtures(directory, synthetic_catalog(args.champions))
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+    environment, results = run(args, app)
+
+    if args.update_baseline:
+        passes = [results] + [run(args, app)[1] for _ in range(args.runs - 1)]
+        relative = {name: statistics.median(p[name]["relative"] for p in passes) for name in results}
+        calibration = statistics.median(stats["calibration"] for p in passes for stats in p.values())
+        compare(results, relative, args.tolerance)
+        # Results are in multiples of the calibration workload, calibration_ms is for reference
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment, "calibration_ms": round(calibration, 3),
+                       "results": {name: round(value, 4) for name, value in relative.items()}},
+                      f, indent=2)
+            f.write("\n")
+        print(f"Baseline of {len(passes)} passes written to {baseline_path}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        baseline = stored["results"]
+        if stored["environment"] != environment:
+            print(f"Note: baseline recorded on {stored['environment']}, not this environment")
+
+    # A slowdown shows in every pass, noise rarely does: keep each measurement's best pass
+    for attempt in range(2, args.runs + 1):
+        over = [name for name, stats in results.items() if regressed(stats, baseline.get(name), args.tolerance)]
+        if not over:
+            break
+        print(f"Over the baseline: {', '.join(over)}; measuring again ({attempt}/{args.runs})")
+        for name, stats in run(args, app)[1].items():
+            if stats["relative"] < results[name]["relative"]:
+                results[name] = stats
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} measurement(s) regressed by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
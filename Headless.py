@@ -0,0 +1,91 @@
+import signal
+import threading
+import StartupProfile
+from AccountManager import AccountManager, load_accounts
+from ClientWatcher import ClientWatcher, find_lockfile
+from ConfigStore import get_config_store
+from EventBus import STATUS_CHANGED
+from LCUConnector import LCUConnector
+from NotificationDispatcher import get_dispatcher
+import ChampionCatalog
+import EventLog
+import Persistence
+
+
+def print_events(event_log):
+    """Write the activity log to stdout, one line per event"""
+    def on_event(event):
+        source = f"[{event.source}] " if event.source else ""
+        print(f"{event.level:<7} {source}{event.message}", flush=True)
+    event_log.add_listener(on_event)
+
+
+def run(args):
+    """Run the automation without a window until Ctrl+C or SIGTERM.
+
+    Picks/bans and config.json are read from disk as in the GUI; edits to them apply while running.
+    """
+    config_store = get_config_store()
+    config_store.watch()
+    catalog = ChampionCatalog.load_cache()
+    if catalog:
+        ChampionCatalog.set_catalog(catalog)
+    else:
+        print("No champion catalog found, picks and bans resolve once the client reports its champions")
+
+    event_log = EventLog.get_event_log()
+    print_events(event_log)
+    if args.log_file:
+        event_log.open_file(args.log_file)
+
+    accounts = load_accounts(config_store)
+    account_manager = AccountManager(accounts) if accounts else None
+    controller = account_manager or LCUConnector()
+    controller.bus.subscribe(STATUS_CHANGED, lambda name, connected: print(
+        f"{name or 'League client'}: {'connected' if connected else 'disconnected'}", flush=True))
+    if args.record:
+        # As in the GUI, the first account is the one recorded
+        connector = account_manager.connectors[accounts[0].name] if account_manager else controller
+        connector.start_recording(args.record)
+    # The GUI toggles are not saved, so headless defaults to both on
+    controller.set_auto_accept(not args.no_auto_accept)
+    controller.set_auto_select(not args.no_auto_select)
+
+    client_watcher = None
+    lockfile = None if account_manager else find_lockfile()
+    if account_manager:
+        account_manager.start()
+    elif lockfile:
+        controller.start_connector(use_lockfile=True)
+        client_watcher = ClientWatcher(lockfile, on_started=controller.attach)
+        client_watcher.start()
+    else:
+        controller.start_connector()
+    StartupProfile.mark("connector started")
+    control_server = None
+    if args.control_port:
+        from ControlAPI import ControlServer
+        control_server = ControlServer(controller, args.control_port)
+        control_server.start()
+
+    stopped = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopped.set())
+    # A timeout lets the main thread run the signal handlers, Ctrl+C included on Windows
+    while not stopped.wait(0.5):
+        pass
+
+    print("Stopping...")
+    if control_server:
+        control_server.stop()
+    if client_watcher:
+        client_watcher.stop()
+    controller.stop_recording()
+    if account_manager:
+        account_manager.stop()
+    else:
+        controller.stop_connector()
+    Persistence.flush_all()
+    config_store.stop()
+    get_dispatcher().stop()
+    event_log.close_file()
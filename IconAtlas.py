@@ -0,0 +1,119 @@
+import json
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QGuiApplication, QImage, QPainter, QPixmap
+import os
+import sys
+from ChampionCatalog import resource_path, load_cache
+from ChampionDataFetcher import icon_path
+
+ATLAS_FILE = resource_path("champion_atlas.png")
+ATLAS_INDEX_FILE = resource_path("champion_atlas.json")
+ATLAS_FORMAT = 1
+ATLAS_SIZES = (32, 24)
+ATLAS_COLUMNS = 16
+
+# Every champion gets one cell holding its icon at each size side by side
+CELL_WIDTH = sum(ATLAS_SIZES)
+CELL_HEIGHT = max(ATLAS_SIZES)
+
+
+def size_offset(size):
+    return sum(ATLAS_SIZES[:ATLAS_SIZES.index(size)])
+
+
+def build_atlas(champion_names):
+    """Pack every cached champion icon, pre-scaled to each atlas size, into one image plus index"""
+    names = [name for name in sorted(champion_names) if os.path.exists(icon_path(name))]
+    rows = max(1, (len(names) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS)
+    atlas = QImage(ATLAS_COLUMNS * CELL_WIDTH, rows * CELL_HEIGHT, QImage.Format_ARGB32_Premultiplied)
+    atlas.fill(Qt.transparent)
+
+    packed = []
+    painter = QPainter(atlas)
+    for name in names:
+        source = QImage(icon_path(name))
+        if source.isNull():
+            continue
+        cell = len(packed)
+        x = (cell % ATLAS_COLUMNS) * CELL_WIDTH
+        y = (cell // ATLAS_COLUMNS) * CELL_HEIGHT
+        for size in ATLAS_SIZES:
+            scaled = source.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            painter.drawImage(x + size_offset(size), y, scaled)
+        packed.append(name)
+    painter.end()
+
+    tmp_file = f"{ATLAS_FILE}.part"
+    if not atlas.save(tmp_file, "PNG"):
+        raise IOError(f"Could not write {ATLAS_FILE}")
+    os.replace(tmp_file, ATLAS_FILE)
+
+    # Offsets follow from a name's position, so the index is just the ordered name list
+    index = {"format": ATLAS_FORMAT, "sizes": list(ATLAS_SIZES), "columns": ATLAS_COLUMNS, "names": packed}
+    with open(ATLAS_INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    return len(packed)
+
+
+def atlas_names():
+    """Names packed in the current atlas, or an empty set if there is none"""
+    try:
+        with open(ATLAS_INDEX_FILE, "r", encoding="utf-8") as f:
+            return set(json.load(f)["names"])
+    except (OSError, ValueError, KeyError):
+        return set()
+
+
+class IconAtlas:
+    """Pre-scaled champion icons loaded from a single atlas image"""
+
+    def __init__(self, pixmap, index):
+        self._pixmap = pixmap
+        self.sizes = tuple(index["sizes"])
+        self.columns = index["columns"]
+        self._cells = {name: cell for cell, name in enumerate(index["names"])}
+
+    @classmethod
+    def load(cls):
+        """Load the atlas with one read of the image file; returns None if it is missing or unusable"""
+        try:
+            with open(ATLAS_INDEX_FILE, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("format") != ATLAS_FORMAT or tuple(index.get("sizes", ())) != ATLAS_SIZES:
+                return None
+            with open(ATLAS_FILE, "rb") as f:
+                data = f.read()
+        except (OSError, ValueError):
+            return None
+
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data, "PNG"):
+            return None
+        return cls(pixmap, index)
+
+    def __contains__(self, name):
+        return name in self._cells
+
+    def pixmap(self, name, size):
+        """Return the pre-scaled icon, or None if the champion or size is not in the atlas"""
+        cell = self._cells.get(name)
+        if cell is None or size not in self.sizes:
+            return None
+        x = (cell % self.columns) * CELL_WIDTH + size_offset(size)
+        y = (cell // self.columns) * CELL_HEIGHT
+        return self._pixmap.copy(QRect(x, y, size, size))
+
+
+def main():
+    app = QGuiApplication(sys.argv)
+    catalog = load_cache()
+    if not catalog:
+        print("No champion cache found, start the app once to download champion data first.")
+        return 1
+    packed = build_atlas(catalog.names())
+    print(f"Packed {packed} champion icons into {ATLAS_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
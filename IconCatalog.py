@@ -0,0 +1,132 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+from PyQt5.QtGui import QPixmap, QIcon
+import os
+from ChampionDataFetcher import icon_path
+from IconAtlas import IconAtlas
+
+MAX_CACHED_ICONS = 512
+COMBO_ICON_SIZE = 24
+
+
+class ChampionListModel(QAbstractListModel):
+    """Sorted champion names shared by every champion combo box; icons are looked up only when painted"""
+
+    def __init__(self, icon_catalog):
+        super().__init__()
+        self.icon_catalog = icon_catalog
+        self._names = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self._names[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return name
+        if role == Qt.DecorationRole:
+            return self.icon_catalog.icon(name, COMBO_ICON_SIZE)
+        return None
+
+    def set_names(self, names):
+        """Apply a new sorted name list as row inserts/removals instead of a full reset"""
+        names = sorted(names)
+        wanted = set(names)
+        for row in reversed(range(len(self._names))):
+            if self._names[row] not in wanted:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._names[row]
+                self.endRemoveRows()
+
+        for name in names:
+            row = bisect_left(self._names, name)
+            if row < len(self._names) and self._names[row] == name:
+                continue
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._names.insert(row, name)
+            self.endInsertRows()
+
+    def refresh_icons(self):
+        if self._names:
+            self.dataChanged.emit(self.index(0), self.index(len(self._names) - 1), [Qt.DecorationRole])
+
+
+class ChampionFilterModel(QSortFilterProxyModel):
+    """Per-combo view of the shared champion model that hides champions already in the list"""
+
+    def __init__(self, source_model, parent=None):
+        super().__init__(parent)
+        self._excluded = frozenset()
+        self.setSourceModel(source_model)
+
+    def set_excluded(self, names):
+        names = frozenset(names)
+        if names != self._excluded:
+            self._excluded = names
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        return self.sourceModel().data(index) not in self._excluded
+
+
+class IconCatalog:
+    """Process-wide store of decoded champion icons, shared by every role tab"""
+
+    def __init__(self, max_entries=MAX_CACHED_ICONS):
+        self.max_entries = max_entries
+        self.catalog = None
+        self._pixmaps = OrderedDict()
+        self._icons = OrderedDict()
+        self.atlas = IconAtlas.load()
+        self.model = ChampionListModel(self)
+
+    def set_champions(self, catalog):
+        """Swap in a new champion catalog, keeping decoded icons of champions that are still in it"""
+        self.catalog = catalog
+        for cache in (self._pixmaps, self._icons):
+            for key in [key for key in cache if key[0] not in catalog]:
+                del cache[key]
+        self.model.set_names(catalog.names())
+
+    def invalidate(self):
+        """Forget every decoded icon, e.g. after new icon files were downloaded"""
+        self._pixmaps.clear()
+        self._icons.clear()
+        self.atlas = IconAtlas.load()
+        self.model.refresh_icons()
+
+    def pixmap(self, name, size):
+        """Return the champion icon scaled to size x size, or None if it is not on disk"""
+        key = (name, size)
+        if key in self._pixmaps:
+            self._pixmaps.move_to_end(key)
+            return self._pixmaps[key]
+
+        pixmap = self.atlas.pixmap(name, size) if self.atlas else None
+        path = icon_path(name)
+        if pixmap is None and os.path.exists(path):
+            pixmap = QPixmap(path).scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        # Misses are cached too so a missing icon does not cost a stat() on every lookup
+        self._remember(self._pixmaps, key, pixmap)
+        return pixmap
+
+    def icon(self, name, size):
+        """Return a QIcon for combo boxes, or None if the icon is not on disk"""
+        key = (name, size)
+        if key in self._icons:
+            self._icons.move_to_end(key)
+            return self._icons[key]
+
+        pixmap = self.pixmap(name, size)
+        icon = QIcon(pixmap) if pixmap is not None else None
+        self._remember(self._icons, key, icon)
+        return icon
+
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
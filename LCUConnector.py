@@ -1,39 +1,127 @@
-import requests
 import asyncio
+from collections import ChainMap
 import time
-from threading import Thread
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
-                             QWidget, QLabel, QPushButton, QCheckBox, QComboBox,
-                             QScrollArea, QGridLayout, QFrame, QMessageBox, QLineEdit,
-                             QTextEdit, QTabWidget, QSplitter)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QSize, QObject
-from PyQt5.QtGui import QPixmap, QFont, QPalette, QColor, QIcon
-from lcu_driver import Connector
+from threading import Thread, Event, Lock
 import os
 import json
-from WhatsAppNotifier import send_notification
+from NotificationDispatcher import get_dispatcher
+from EventBus import EventBus, STATUS_CHANGED, STATE_CHANGED
+import EventLog
+from ChampSelectResolver import ChampSelectResolver
+from Persistence import store_for
+from ChampSelectState import ChampSelectStateMachine, ENTERED, EXITED, ROLE, MY_ACTION, BOARD
+import LatencyStats
+import StartupProfile
+import ChampionCatalog
+from ChampionInventory import ChampionInventory
+from EventRecorder import EventRecorder
 
 PICKS_BANS_FILE = "picks_bans.json"
 ROLES = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+IN_GAME_PHASES = ("GameStart", "InProgress", "Reconnect")
+LIVE_CLIENT_URL = "https://127.0.0.1:2999/liveclientdata/gamestats"
+LIVE_CLIENT_MIN_DELAY = 1
+LIVE_CLIENT_MAX_DELAY = 30
+
+class GameStartPoller:
+    """Fallback game start detection through the live client API, for connectors whose LCU websocket is down.
+
+    The live client API belongs to whichever game runs on this machine, so one poller thread serves
+    every connector in the process. It sleeps until a connector sets fallback_polling and calls wake().
+    """
 
-class LCUConnector(QObject):
-    """Handles League Client connection and automation"""
-    status_changed = pyqtSignal(bool)
-    game_event = pyqtSignal(str)
-    
     def __init__(self):
-        super().__init__()
-        self.connector = Connector()
+        self.connectors = []
+        self._wake = Event()
+        self._thread = None
+
+    def add(self, connector):
+        self.connectors.append(connector)
+        if self._thread is None:
+            self._thread = Thread(target=self.run, daemon=True)
+            self._thread.start()
+        self.wake()
+
+    def wake(self):
+        self._wake.set()
+
+    def run(self):
+        import requests
+        # The live client API uses a self-signed certificate
+        requests.packages.urllib3.disable_warnings()
+        session = requests.Session()
+        session.verify = False
+        delay = LIVE_CLIENT_MIN_DELAY
+        while True:
+            waiting = [connector for connector in self.connectors if connector.fallback_polling.is_set()]
+            if not waiting:
+                self._wake.wait()
+                self._wake.clear()
+                delay = LIVE_CLIENT_MIN_DELAY
+                continue
+            try:
+                response = session.get(LIVE_CLIENT_URL, timeout=2)
+                if response.status_code == 200:
+                    if response.json().get('gameTime', 0) > 0:
+                        for connector in waiting:
+                            if not connector.in_game:
+                                connector.in_game = True
+                                connector.on_game_started()
+                        # In game, only the end of the game is left to notice
+                        delay = LIVE_CLIENT_MAX_DELAY
+                    else:
+                        # Loading screen, the game is about to start
+                        delay = LIVE_CLIENT_MIN_DELAY
+                else:
+                    delay = min(delay * 2, LIVE_CLIENT_MAX_DELAY)
+            except requests.exceptions.RequestException:
+                for connector in waiting:
+                    connector.in_game = False # Reset when game ends or client closes
+                delay = min(delay * 2, LIVE_CLIENT_MAX_DELAY)
+            time.sleep(delay)
+
+
+class LCUConnector:
+    """Handles League Client connection and automation.
+
+    Plain asyncio without Qt: state changes are published on bus (see EventBus), which the GUI
+    adapts to signals through QtBridge and the headless mode uses directly.
+    """
+
+    def __init__(self, picks_bans_file=PICKS_BANS_FILE, loop=None, poller=None, dispatcher=None,
+                 name=None, event_log=None, bus=None):
+        """loop, poller and bus can be shared between connectors, see AccountManager. name tags the log events."""
+        self.name = name
+        self.bus = bus or EventBus()
+        self.event_log = event_log or EventLog.get_event_log()
+        self.dispatcher = dispatcher or get_dispatcher()
+        # lcu_driver (and aiohttp under it) is imported when the connector is first used, after the window is up
+        self._connector = None
+        self._connector_loop = loop
+        self._connector_lock = Lock()
+        self.picks_bans_file = picks_bans_file
+        self.picks_bans_store = store_for(picks_bans_file)
+        self.picks_bans_store.add_listener(self.on_picks_bans_changed)
         self.summoner_id = None
-        self.champions_map = {}
-        self.picks_bans = {role: {"picks": [], "bans": []} for role in ROLES}
-        self.notifications_config = {}
+        self.inventory = None
+        self.connected = False
+        # Picks and bans are Data Dragon names: resolve them through the shared catalog first, then
+        # through the client's own inventory names for champions newer than the cached catalog
+        self.champions_map = ChainMap(ChampionCatalog.get_catalog().keys_by_name, {})
+        ChampionCatalog.add_listener(self.on_catalog_changed)
         self.current_role = "TOP"
-        self.pick_number = 0
-        self.ban_number = 0
+        self.resolver = ChampSelectResolver()
+        self.champ_select = ChampSelectStateMachine()
+        self.pending_session = None
+        self.champ_select_busy = False
+        self.action_started_at = None
+        self.recorder = None
+        self.picks = []
+        self.bans = []
         self.auto_accept_enabled = False
         self.auto_select_enabled = False
         self.pick_in_progress = False
+        self.ban_in_progress = False
         
         # State variables
         self.am_i_assigned = False
@@ -42,212 +130,167 @@ class LCUConnector(QObject):
         self.in_game = False
         self.phase = ''
         self.action_id = None
-        
-        # Suppress insecure request warnings
-        requests.packages.urllib3.disable_warnings()
+        self.gameflow_phase = None
+        # Set while the LCU websocket is down, enabling the live client fallback poller
+        self.fallback_polling = Event()
+        self.fallback_polling.set()
 
-        # Load picks and bans on initialization
-        self.load_picks_and_bans()
-        self.setup_connector()
 
-        # Start game start polling
-        polling_thread = Thread(target=self.poll_game_start, daemon=True)
-        polling_thread.start()
+        # Register with the fallback game start poller, idle while the gameflow websocket is up
+        self.poller = poller or GameStartPoller()
+        self.poller.add(self)
     
-    def init_notification_system(self):
-        self.game_event.emit("Initializing notification system...")
-        try:
-            if os.path.exists("config.json"):
-                with open("config.json", "r") as f:
-                    config = json.load(f)
-                    self.notifications_config = config.get("whatsapp_notifications", {})
-            self.game_event.emit("Notification system initialized.")
-        except Exception as e:
-            self.game_event.emit(f"Error loading notification config: {str(e)}")
+    @property
+    def connector(self):
+        if self._connector is None:
+            with self._connector_lock:
+                if self._connector is None:
+                    from lcu_driver import Connector
+                    connector = Connector(loop=self._connector_loop)
+                    self.setup_connector(connector)
+                    self._connector = connector
+        return self._connector
 
-    def load_picks_and_bans(self):
-        """Load picks and bans from files"""
+    async def refresh_inventory(self, connection):
+        """Rebuild the inventory from the client, in the background of the ready handler"""
+        inventory = self.inventory
         try:
-            if os.path.exists(PICKS_BANS_FILE):
-                with open(PICKS_BANS_FILE, "r", encoding="utf-8") as f:
-                    self.picks_bans = json.load(f)
-            else:
-                for role in ROLES:
-                    self.picks_bans[role]["picks"] = []
-                    self.picks_bans[role]["bans"] = []
-            self.game_event.emit(f"Loaded picks and bans from {PICKS_BANS_FILE}")
-        except Exception as e:
-            self.game_event.emit(f"Error loading picks/bans: {str(e)}")
-            self.picks_bans = {role: {"picks": [], "bans": []} for role in ROLES}
-    
-    def save_picks_and_bans(self):
-        try:
-            with open(PICKS_BANS_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.picks_bans, f, ensure_ascii=False, indent=2)
-            self.game_event.emit(f"Saved picks and bans to {PICKS_BANS_FILE}")
+            response = await self.request(connection, 'get',
+                                          f'/lol-champions/v1/inventories/{inventory.summoner_id}/champions-minimal')
+            if response.status == 200:
+                inventory.rebuild(await response.json())
         except Exception as e:
-            self.game_event.emit(f"Error saving picks/bans: {str(e)}")
-    
-    def setup_connector(self):
+            self.log("connection", f'Error refreshing the champion inventory: {str(e)}', EventLog.WARNING)
+
+    def on_inventory_changed(self, inventory):
+        self.champions_map = ChainMap(self.champions_map.maps[0], inventory.names)
+        if inventory.owned is not None:
+            self.resolver.set_owned(inventory.owned)
+
+    def on_catalog_changed(self, catalog):
+        self.champions_map = ChainMap(catalog.keys_by_name, self.champions_map.maps[1])
+
+    def set_connected(self, connected):
+        self.connected = connected
+        self.bus.publish(STATUS_CHANGED, self.name, connected)
+        self.state_changed()
+
+    def state_changed(self):
+        self.bus.publish(STATE_CHANGED, self.name)
+
+    def state(self):
+        """Snapshot of what external tools see, see ControlAPI; safe to call from any thread"""
+        return {
+            "name": self.name,
+            "connected": self.connected,
+            "auto_accept": self.auto_accept_enabled,
+            "auto_select": self.auto_select_enabled,
+            "gameflow_phase": self.gameflow_phase,
+            "in_game": self.in_game,
+            "role": self.current_role if self.am_i_assigned else None,
+            "champ_select_action": self.phase or None,
+            "picks_bans": self.picks_bans_store.snapshot(),
+        }
+
+    def log(self, kind, message, level=EventLog.INFO):
+        self.event_log.add(kind, message, level, self.name)
+
+    def setup_connector(self, connector):
         """Setup LCU connector events"""
-        @self.connector.ready
+        @connector.ready
         async def connect(connection):
             try:
-                temp_champions_map = {}
-                summoner = await connection.request('get', '/lol-summoner/v1/current-summoner')
+                summoner = await self.request(connection, 'get', '/lol-summoner/v1/current-summoner')
                 summoner_to_json = await summoner.json()
                 self.summoner_id = summoner_to_json['summonerId']
-                
-                champion_list = await connection.request('get', f'/lol-champions/v1/inventories/{self.summoner_id}/champions-minimal')
-                champion_list_to_json = await champion_list.json()
-                
-                for i in range(len(champion_list_to_json)):
-                    temp_champions_map.update({champion_list_to_json[i]['name']: champion_list_to_json[i]['id']})
-                
-                self.champions_map = temp_champions_map
-                self.status_changed.emit(True)
-                self.game_event.emit('LCU API is ready to be used.')
-                
-                # Reload picks and bans to ensure they're current
-                self.load_picks_and_bans()
-                
+
+                # The cached inventory applies right away, the refresh and inventory events follow
+                if self.inventory is None or self.inventory.summoner_id != self.summoner_id:
+                    self.inventory = ChampionInventory(self.summoner_id)
+                    self.inventory.add_listener(self.on_inventory_changed)
+                self.on_inventory_changed(self.inventory)
+                asyncio.ensure_future(self.refresh_inventory(connection))
+
+                # Game start/end now comes from gameflow events, sync with the current phase once
+                phase = await self.request(connection, 'get', '/lol-gameflow/v1/gameflow-phase')
+                self.fallback_polling.clear()
+                if phase.status == 200:
+                    self.update_gameflow_phase(await phase.json())
+
+                self.set_connected(True)
+                self.log("connection", 'LCU API is ready to be used.')
+                StartupProfile.finish("connector ready")
+                                
             except Exception as e:
-                self.game_event.emit(f'Error connecting to LCU: {str(e)}')
-                self.status_changed.emit(False)
+                self.log("connection", f'Error connecting to LCU: {str(e)}', EventLog.ERROR)
+                self.set_connected(False)
 
-        @self.connector.ws.register('/lol-matchmaking/v1/ready-check', event_types=('UPDATE',))
+        @connector.ws.register('/lol-matchmaking/v1/ready-check', event_types=('UPDATE',))
         async def ready_check_changed(connection, event):
+            received_at = time.perf_counter()
+            if self.recorder:
+                self.recorder.write(event)
             if self.auto_accept_enabled and event.data['state'] == 'InProgress' and event.data['playerResponse'] == 'None':
-                await connection.request('post', '/lol-matchmaking/v1/ready-check/accept', data={})
-                self.game_event.emit('Auto-accepted queue!')
+                await self.request(connection, 'post', '/lol-matchmaking/v1/ready-check/accept', data={})
+                LatencyStats.histogram(LatencyStats.READY_CHECK_ACCEPT).record_since(received_at)
+                self.log("queue", 'Auto-accepted queue!')
+
+        @connector.ws.register('/lol-gameflow/v1/gameflow-phase', event_types=('CREATE', 'UPDATE',))
+        async def gameflow_phase_changed(connection, event):
+            if self.recorder:
+                self.recorder.write(event)
+            self.update_gameflow_phase(event.data)
 
-        @self.connector.ws.register('/lol-champ-select/v1/session', event_types=('CREATE', 'UPDATE',))
+        @connector.ws.register('/lol-champ-select/v1/session', event_types=('CREATE', 'UPDATE',))
         async def champ_select_changed(connection, event):
-            
-            have_i_prepicked = False
-            lobby_phase = event.data['timer']['phase']
-            print(f"Lobby phase: {lobby_phase}, Current phase: {self.phase}")
-            
-            local_player_cell_id = event.data['localPlayerCellId']
-            assigned_role = None
-            for teammate in event.data['myTeam']:
-                if teammate['cellId'] == local_player_cell_id:
-                    assigned_role = teammate.get('assignedPosition', 'TOP').upper()
-                    break
-            if assigned_role not in ROLES:
-                assigned_role = 'TOP'
-            self.current_role = assigned_role
-            picks = self.picks_bans.get(assigned_role, {}).get('picks', [])
-            bans = self.picks_bans.get(assigned_role, {}).get('bans', [])
-            self.picks = picks.copy()
-            self.bans = bans.copy()
-            
-            if lobby_phase not in ['PLANNING', 'BAN_PICK', 'FINALIZATION'] or not event.data.get("actions"):
-                self.pick_number = 0
-                self.ban_number = 0
-                self.pick_in_progress = False
-                self.ban_in_progress = False
-                self.am_i_picking = False
-                self.am_i_banning = False
-                self.am_i_assigned = False
-                self.in_game = False
-                self.phase = ''
-                self.action_id = None
-                self.game_event.emit("Champ Select exited (cancelled/quit) — state reset.")
-                return  
-            # Check if assigned to position
-            for teammate in event.data['myTeam']:
-                if teammate['cellId'] == local_player_cell_id:
-                    self.am_i_assigned = True
-            
-            # Check current action
-            for action in event.data['actions']:
-                for actionArr in action:
-                    if actionArr['actorCellId'] == local_player_cell_id and actionArr['isInProgress'] == True:
-                        self.phase = actionArr['type']
-                        self.action_id = actionArr['id']
-                        if self.phase == 'ban':
-                            self.am_i_banning = actionArr['isInProgress']
-                        if self.phase == 'pick':
-                            self.am_i_picking = actionArr['isInProgress']
-            
-            if not self.auto_select_enabled:
+            if self.recorder:
+                self.recorder.write(event)
+            # A burst of updates collapses into the latest session while one is being handled. It keeps
+            # the arrival time of the oldest one, so lock-in latency includes the time spent queued.
+            received_at = time.perf_counter()
+            if self.pending_session is not None:
+                self.champ_select.note_coalesced()
+                received_at = self.pending_session[1]
+            self.pending_session = (event.data, received_at)
+            if self.champ_select_busy:
                 return
+            self.champ_select_busy = True
+            try:
+                while self.pending_session is not None:
+                    (session, received_at), self.pending_session = self.pending_session, None
+                    try:
+                        await self.handle_champ_select(connection, session, received_at)
+                    except Exception as e:
+                        self.log("champ_select", f'Error handling champ select update: {str(e)}', EventLog.ERROR)
+            finally:
+                self.champ_select_busy = False
             
-            
-            # Auto ban
-            if self.phase == 'ban' and lobby_phase == 'BAN_PICK' and self.am_i_banning and self.bans:
-                try:
-                    if self.ban_number < len(self.bans):
-                        champion_name = self.bans[self.ban_number]
-                        if champion_name in self.champions_map:
-                            await connection.request('patch', '/lol-champ-select/v1/session/actions/%d' % self.action_id,
-                                                   data={"championId": self.champions_map[champion_name], "completed": True})
-                            self.game_event.emit(f'Auto-banned: {champion_name}')
-                            self.ban_number += 1
-                            self.am_i_banning = False
-                except Exception as e:
-                    self.game_event.emit(f'Failed to ban {champion_name}: {str(e)}')
-                    self.ban_number += 1
-                    if self.ban_number >= len(self.bans):
-                        self.ban_number = 0
-            
-            # Auto pick
-            if self.phase == 'pick' and lobby_phase == 'BAN_PICK' and self.am_i_picking and self.picks and not self.pick_in_progress:
-                self.pick_in_progress = True  # start pick session
-                try:
-                    picked = False
-                    for i in range(self.pick_number, len(self.picks)):
-                        champion_name = self.picks[i]
-                        try:
-                            if champion_name in self.champions_map:
-                                champion_id = self.champions_map[champion_name]
-                                response = await connection.request(
-                                    'patch',
-                                    f'/lol-champ-select/v1/session/actions/{self.action_id}',
-                                    data={"championId": champion_id, "completed": True}
-                                )
-
-                                # Check if the response was successful
-                                if response.status == 204:
-                                    self.game_event.emit(f'Auto-picked: {champion_name}')
-                                    self.pick_number = i + 1
-                                    self.am_i_picking = False
-                                    picked = True
-                                    break  
-                                else:
-                                    self.game_event.emit(f"Pick failed for {champion_name}, trying next...")
-
-                        except Exception as e:
-                            self.game_event.emit(f'Failed to pick {champion_name}: {str(e)}')
-                        
-                        await asyncio.sleep(1.5)  
-
-                    if not picked:
-                        self.game_event.emit("No valid champions could be picked from the list.")
-                        self.pick_number = 0  
-
-                except Exception as e:
-                    self.game_event.emit(f'Error during picking phase: {str(e)}')
-                finally:
-                    self.pick_in_progress = False
-            
-            # Pre-pick (hover)
-            if lobby_phase == 'PLANNING' and not have_i_prepicked and self.picks:
-                try:
-                    first_pick = self.picks[0] if self.picks else 'Teemo'
-                    if first_pick in self.champions_map:
-                        await connection.request('patch', '/lol-champ-select/v1/session/actions/%d' % self.action_id,
-                                               data={"championId": self.champions_map[first_pick], "completed": False})
-                        self.game_event.emit(f'Pre-picked: {first_pick}')
-                        have_i_prepicked = True
-                except Exception as e:
-                    self.game_event.emit(f'Failed to pre-pick: {str(e)}')
-            
-        @self.connector.close
+        @connector.ws.register('/lol-champions/v1/inventories/', event_types=('CREATE', 'UPDATE',))
+        async def inventory_changed(connection, event):
+            if self.inventory is None:
+                return
+            prefix = f'/lol-champions/v1/inventories/{self.inventory.summoner_id}/'
+            if not event.uri.startswith(prefix):
+                return
+            endpoint = event.uri[len(prefix):]
+            if endpoint == 'champions-minimal' and isinstance(event.data, list):
+                if self.recorder:
+                    self.recorder.write(event)
+                self.inventory.rebuild(event.data)
+            elif endpoint.startswith('champions/') and endpoint.count('/') == 1 and isinstance(event.data, dict):
+                if self.recorder:
+                    self.recorder.write(event)
+                self.inventory.update(event.data)
+                # The client reports ownership now but the full list never came: fetch it
+                if self.inventory.owned is None and 'ownership' in event.data:
+                    asyncio.ensure_future(self.refresh_inventory(connection))
+
+        @connector.close
         async def disconnect(_):
-            self.status_changed.emit(False)
-            self.game_event.emit('The client has been closed!')
+            self.fallback_polling.set()
+            self.poller.wake()
+            self.gameflow_phase = None
+            self.log("connection", 'The client has been closed!')
             
             # Reset only game state variables, NOT picks and bans
             self.am_i_assigned = False
@@ -256,77 +299,279 @@ class LCUConnector(QObject):
             self.in_game = False
             self.phase = ''
             self.action_id = None
+            self.action_started_at = None
             
-            # Reset counters but keep picks and bans persistent
-            self.pick_number = 0
-            self.ban_number = 0
+            # Reset champ select state but keep picks and bans persistent
+            self.resolver.reset()
+            self.champ_select.reset()
+            self.set_connected(False)
             
             # Log that picks and bans are preserved
-            self.game_event.emit(f'Picks and bans preserved: {len(self.picks)} picks, {len(self.bans)} bans')
+            self.log("champ_select", f'Picks and bans preserved: {len(self.picks)} picks, {len(self.bans)} bans')
             
-    def poll_game_start(self):
-        """Polls the live client data endpoint to detect game start."""
+    def start_recording(self, path):
+        """Write every websocket event handled from now on to path, for EventReplay.py"""
+        self.stop_recording()
+        self.recorder = EventRecorder(path)
+        self.log("recording", f'Recording LCU events to {path}')
+
+    def stop_recording(self):
+        recorder, self.recorder = self.recorder, None
+        if recorder:
+            recorder.close()
+            self.log("recording", f'Recorded {recorder.count} LCU events to {recorder.path}')
+
+    def update_gameflow_phase(self, phase):
+        """Track game start/end from the LCU gameflow phase"""
+        if phase == self.gameflow_phase:
+            return
+        self.gameflow_phase = phase
+        if phase in IN_GAME_PHASES:
+            if not self.in_game:
+                self.in_game = True
+                self.on_game_started()
+        elif self.in_game:
+            self.in_game = False
+            self.log("game", "Game ended.")
+        self.state_changed()
+
+    def on_game_started(self):
+        self.log("game", "Game started!")
+        # Keyed per summoner, so the websocket and the fallback poller seeing the same start notify once
+        self.dispatcher.notify("Your League of Legends game is starting now!",
+                               key=f"game_start:{self.summoner_id}", on_done=self.on_notification_done)
+
+    def on_notification_done(self, backend, ok, error):
+        if ok:
+            self.log("notification", f"{backend} notification sent successfully.")
+        else:
+            self.log("notification", f"Failed to send {backend} notification: {error}", EventLog.WARNING)
+
+    async def handle_champ_select(self, connection, session, received_at=None):
+        """React to the parts of a champ select session that changed since the last one.
+
+        received_at is the perf_counter() time the event arrived, used for lock-in latency.
+        """
+        state = self.champ_select
+        changes = state.feed(session)
+        if not changes:
+            return
+
+        if EXITED in changes:
+            stats = state.stats()
+            self.resolver.reset()
+            self.pick_in_progress = False
+            self.ban_in_progress = False
+            self.am_i_picking = False
+            self.am_i_banning = False
+            self.am_i_assigned = False
+            self.phase = ''
+            self.action_id = None
+            self.action_started_at = None
+            self.log("champ_select", "Champ Select exited (cancelled/quit) — state reset.")
+            self.log("champ_select", f"Champ select events: {stats['events']} received, {stats['coalesced']} coalesced, "
+                                 f"{stats['avg_cpu_us']:.0f} µs CPU per event")
+            self.state_changed()
+            return
+
+        if ROLE in changes:
+            self.current_role = state.role
+            self.am_i_assigned = True
+            lists = self.picks_bans_store.lists(state.role)
+            self.picks = list(lists['picks'])
+            self.bans = list(lists['bans'])
+
+        if MY_ACTION in changes:
+            if state.my_action:
+                self.action_id, self.phase = state.my_action
+                self.action_started_at = received_at if received_at is not None else time.perf_counter()
+            else:
+                self.action_started_at = None
+            self.am_i_banning = state.my_action is not None and self.phase == 'ban'
+            self.am_i_picking = state.my_action is not None and self.phase == 'pick'
+
+        if ROLE in changes or MY_ACTION in changes:
+            self.state_changed()
+
+        if BOARD in changes:
+            self.resolver.update_session(session)
+
+        if ENTERED in changes:
+            # Pickable/bannable ids only change with ownership, so fetch them once per champ select
+            await self.load_availability(connection)
+
+        if not self.auto_select_enabled:
+            return
+
+        lobby_phase = state.phase
+
+        # Auto ban
+        if self.phase == 'ban' and lobby_phase == 'BAN_PICK' and self.am_i_banning and self.bans and not self.ban_in_progress:
+            self.ban_in_progress = True
+            try:
+                champion_name = await self.lock_in(connection, self.bans, self.resolver.first_ban, 'ban')
+                if champion_name:
+                    self.log("champ_select", f'Auto-banned: {champion_name}')
+                    self.am_i_banning = False
+                else:
+                    self.log("champ_select", "No valid champions could be banned from the list.", EventLog.WARNING)
+            except Exception as e:
+                self.log("champ_select", f'Error during banning phase: {str(e)}', EventLog.ERROR)
+            finally:
+                self.ban_in_progress = False
+
+        # Auto pick
+        if self.phase == 'pick' and lobby_phase == 'BAN_PICK' and self.am_i_picking and self.picks and not self.pick_in_progress:
+            self.pick_in_progress = True  # start pick session
+            try:
+                champion_name = await self.lock_in(connection, self.picks, self.resolver.first_pick, 'pick')
+                if champion_name:
+                    self.log("champ_select", f'Auto-picked: {champion_name}')
+                    self.am_i_picking = False
+                else:
+                    self.log("champ_select", "No valid champions could be picked from the list.", EventLog.WARNING)
+            except Exception as e:
+                self.log("champ_select", f'Error during picking phase: {str(e)}', EventLog.ERROR)
+            finally:
+                self.pick_in_progress = False
+
+        # Pre-pick (hover) once per champ select, on my pick action even before it is in progress
+        if lobby_phase == 'PLANNING' and not state.hovered and self.picks and state.my_pick_action_id is not None:
+            try:
+                candidate = self.resolver.first_pick(self.picks, self.champions_map)
+                if candidate:
+                    first_pick, champion_id = candidate
+                    await self.request(connection, 'patch', f'/lol-champ-select/v1/session/actions/{state.my_pick_action_id}',
+                                             data={"championId": champion_id, "completed": False})
+                    self.log("champ_select", f'Pre-picked: {first_pick}')
+                    state.hovered = True
+            except Exception as e:
+                self.log("champ_select", f'Failed to pre-pick: {str(e)}', EventLog.WARNING)
+
+    async def load_availability(self, connection):
+        """Fetch the pickable and bannable champion ids of the current champ select"""
+        pickable, bannable = await asyncio.gather(
+            self.request(connection, 'get', '/lol-champ-select/v1/pickable-champion-ids'),
+            self.request(connection, 'get', '/lol-champ-select/v1/bannable-champion-ids'))
+        if pickable.status == 200:
+            self.resolver.set_pickable(await pickable.json())
+        if bannable.status == 200:
+            self.resolver.set_bannable(await bannable.json())
+
+    async def lock_in(self, connection, names, choose, action_type):
+        """Lock in the first available champion from names with a single PATCH.
+
+        A champion the client refuses (a 4xx) is marked unavailable for this action type and the next
+        candidate is tried right away. Timeouts and server errors say nothing about the champion:
+        the request is retried once, then the error is raised and the next session event tries again.
+        Returns the locked-in name, or None when no candidate is left.
+        """
+        retried = False
         while True:
+            candidate = choose(names, self.champions_map)
+            if candidate is None:
+                return None
+            champion_name, champion_id = candidate
             try:
-                response = requests.get('https://127.0.0.1:2999/liveclientdata/allgamedata', verify=False)
-                if response.status_code == 200:
-                    game_data = response.json()
-                    if game_data.get('gameData', {}).get('gameTime', 0) > 0 and not self.in_game:
-                        self.in_game = True
-                        self.game_event.emit("Game started!")
-                        if self.notifications_config.get("enabled"):
-                            def send_and_log_notification():
-                                self.game_event.emit("Sending WhatsApp notification...")
-                                success = send_notification(
-                                    to_number=self.notifications_config.get("to_number"),
-                                    message="Your League of Legends game is starting now!",
-                                    twilio_sid=self.notifications_config.get("twilio_sid"),
-                                    twilio_token=self.notifications_config.get("twilio_token"),
-                                    from_number=self.notifications_config.get("from_number")
-                                )
-                                if success:
-                                    self.game_event.emit("WhatsApp notification sent successfully.")
-                                else:
-                                    self.game_event.emit("Failed to send WhatsApp notification.")
-
-                            notification_thread = Thread(target=send_and_log_notification, daemon=True)
-                            notification_thread.start()
-            except requests.exceptions.RequestException:
-                self.in_game = False # Reset when game ends or client closes
-            time.sleep(5)
+                response = await self.request(
+                    connection,
+                    'patch',
+                    f'/lol-champ-select/v1/session/actions/{self.action_id}',
+                    data={"championId": champion_id, "completed": True}
+                )
+            except Exception as e:
+                error = str(e)
+            else:
+                if response.status == 204:
+                    if self.action_started_at is not None:
+                        LatencyStats.histogram(LatencyStats.LOCK_IN).record_since(self.action_started_at)
+                        self.action_started_at = None
+                    return champion_name
+                error = f"HTTP {response.status}"
+                if 400 <= response.status < 500 and response.status != 429:
+                    self.log("champ_select", f"{action_type.capitalize()} refused for {champion_name} ({error}), trying next...", EventLog.WARNING)
+                    self.resolver.reject(champion_id, action_type)
+                    continue
+            if retried:
+                raise RuntimeError(f"Failed to {action_type} {champion_name}: {error}")
+            retried = True
+            self.log("champ_select", f'Failed to {action_type} {champion_name} ({error}), retrying...', EventLog.WARNING)
+
+    async def request(self, connection, method, endpoint, **kwargs):
+        """connection.request with its round-trip time recorded in the LCU request histogram"""
+        start = time.perf_counter()
+        try:
+            return await connection.request(method, endpoint, **kwargs)
+        finally:
+            LatencyStats.histogram(LatencyStats.LCU_REQUEST).record_since(start)
+
+    def start_connector(self, use_lockfile=False):
+        """Start the LCU connector in a separate thread.
 
-    def start_connector(self):
-        """Start the LCU connector in a separate thread"""
+        With use_lockfile the event loop only idles and clients are connected through attach(),
+        otherwise lcu_driver keeps scanning the process list for the client itself.
+        """
         def run_connector():
             try:
-                self.connector.start()
+                if use_lockfile:
+                    asyncio.set_event_loop(self.connector.loop)
+                    self.connector.loop.run_forever()
+                else:
+                    self.connector.start()
             except Exception as e:
-                self.game_event.emit(f'Failed to start connector: {str(e)}')
-                self.status_changed.emit(False)
+                self.log("connection", f'Failed to start connector: {str(e)}', EventLog.ERROR)
+                self.set_connected(False)
         
         thread = Thread(target=run_connector, daemon=True)
         thread.start()
+
+    def attach(self, lockfile_info):
+        """Connect to the client described by a lockfile; safe to call from any thread"""
+        asyncio.run_coroutine_threadsafe(self._attach(lockfile_info), self.connector.loop)
+
+    async def _attach(self, lockfile_info):
+        connection = self.connector.connection
+        if connection is not None and not connection.closed:
+            return
+        self.log("connection", f'Attaching to League client (pid {lockfile_info.pid})...')
+        try:
+            from lcu_driver.connection import Connection
+            await Connection(self.connector, lockfile_info.connection_string()).init()
+        except Exception as e:
+            self.log("connection", f'Lost connection to League client: {str(e)}', EventLog.WARNING)
+            self.set_connected(False)
+
+    def stop_connector(self):
+        """Stop looking for clients and close the current connection"""
+        if self._connector is None:
+            return
+        loop = self._connector.loop
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.connector.stop(), loop)
     
     def update_picks_and_bans(self, picks_bans_dict, _=None):
-        """Update the picks and bans lists"""
-        self.picks_bans = picks_bans_dict.copy()
-        self.save_picks_and_bans()
-        self.pick_number = 0
-        self.ban_number = 0
-        self.game_event.emit(f'Updated picks and bans for all roles.')
-    
-    def update_notifications_config(self, config):
-        self.notifications_config = config
-        self.game_event.emit("Updated WhatsApp notifications config.")
+        """Replace the picks and bans of all roles; the store writes the file"""
+        self.picks_bans_store.replace(picks_bans_dict)
+        self.log("settings", f'Updated picks and bans for all roles.')
 
+    def on_picks_bans_changed(self, role):
+        # Edits made during champ select apply to the role being played right away
+        if self.am_i_assigned and role in (None, self.picks_bans_store.role_key(self.current_role)):
+            lists = self.picks_bans_store.lists(self.current_role)
+            self.picks = list(lists['picks'])
+            self.bans = list(lists['bans'])
+        self.state_changed()
+    
     def set_auto_accept(self, enabled):
         """Enable/disable auto accept"""
         self.auto_accept_enabled = enabled
         status = "enabled" if enabled else "disabled"
-        self.game_event.emit(f'Auto-accept {status}')
+        self.log("settings", f'Auto-accept {status}')
+        self.state_changed()
     
     def set_auto_select(self, enabled):
         """Enable/disable auto select"""
         self.auto_select_enabled = enabled
         status = "enabled" if enabled else "disabled"
-        self.game_event.emit(f'Auto-select {status}')
\ No newline at end of file
+        self.log("settings", f'Auto-select {status}')
+        self.state_changed()
@@ -0,0 +1,52 @@
+from collections import deque
+import time
+
+READY_CHECK_ACCEPT = "ready_check_accept"
+LOCK_IN = "lock_in"
+LCU_REQUEST = "lcu_request"
+NOTIFICATION_DELIVERY = "notification_delivery"
+HISTOGRAM_SIZE = 512
+
+
+class RollingHistogram:
+    """Last N latency samples in milliseconds, with percentiles computed only when asked for.
+
+    Recording is a single deque append, cheap enough to leave on all the time.
+    """
+
+    def __init__(self, size=HISTOGRAM_SIZE):
+        self._samples = deque(maxlen=size)
+        self.count = 0
+
+    def record(self, ms):
+        self._samples.append(ms)
+        self.count += 1
+
+    def record_since(self, start):
+        """Record the time elapsed since a time.perf_counter() value"""
+        self.record((time.perf_counter() - start) * 1000)
+
+    def snapshot(self):
+        """Return count and p50/p90/p99/max over the retained samples, or None if there are none"""
+        samples = sorted(list(self._samples))
+        if not samples:
+            return None
+        last = len(samples) - 1
+        return {
+            "count": self.count,
+            "p50": samples[round(last * 0.50)],
+            "p90": samples[round(last * 0.90)],
+            "p99": samples[round(last * 0.99)],
+            "max": samples[last],
+        }
+
+
+_histograms = {}
+
+
+def histogram(name):
+    """Return the process-wide histogram for name, creating it on first use"""
+    hist = _histograms.get(name)
+    if hist is None:
+        hist = _histograms.setdefault(name, RollingHistogram())
+    return hist
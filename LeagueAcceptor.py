@@ -1,45 +1,66 @@
 import sys
-import json
-import requests
-import urllib3
-import time
-import asyncio
-from threading import Thread
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
-                             QWidget, QLabel, QPushButton, QCheckBox, QComboBox,
-                             QScrollArea, QGridLayout, QFrame, QMessageBox, QLineEdit,
-                             QTextEdit, QTabWidget, QSplitter)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QSize, QObject
-from PyQt5.QtGui import QPixmap, QFont, QPalette, QColor, QIcon
-from lcu_driver import Connector
-import os
-import time
-from GUI import LeagueAssistantApp,load_cached_data,resource_path
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+import StartupProfile
+# Before argparse, so the first mark is not lost; main() sets the flag from the parsed arguments
+StartupProfile.enabled = "--profile-startup" in sys.argv
+StartupProfile.mark("interpreter ready")
+import argparse
+# requests, lcu_driver and twilio are imported by the modules that use them, once they are needed;
+# Qt and the GUI only when running with a window
 
 
 
 
 def main():
-    app = QApplication(sys.argv) 
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--headless", action="store_true",
+                        help="run the automation without a window, logging to stdout; stop with Ctrl+C")
+    parser.add_argument("--no-auto-accept", action="store_true", help="with --headless, do not accept matches")
+    parser.add_argument("--no-auto-select", action="store_true", help="with --headless, do not pick or ban")
+    parser.add_argument("--record", metavar="PATH", help="write every LCU websocket event to PATH for EventReplay.py")
+    parser.add_argument("--log-file", metavar="PATH", help="also write the activity log to PATH, rotated at 1 MB")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each startup phase took, up to the LCU connection being ready")
+    parser.add_argument("--control-port", type=int, metavar="PORT",
+                        help="serve the control API (HTTP and websocket) on 127.0.0.1:PORT")
+    args, qt_args = parser.parse_known_args()
+    StartupProfile.enabled = args.profile_startup
+    if args.headless:
+        import Headless
+        StartupProfile.mark("imports")
+        Headless.run(args)
+        return
+
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    from PyQt5.QtGui import QIcon
+    from GUI import LeagueAssistantApp, resource_path
+    from EventLog import get_event_log
+    StartupProfile.mark("imports")
+    app = QApplication(sys.argv[:1] + qt_args)
+    StartupProfile.mark("QApplication")
     if not LeagueAssistantApp.is_league_running():
         print("League of Legends client is not running. Please start the client first.")
         QMessageBox.critical(None, "League Not Running", "League of Legends client is not running.\nStart the game first.")
         return
+    StartupProfile.mark("client check")
 
-    
-    # Load cached champion data immediately for faster startup
-    cached_data = load_cached_data()
     app.setWindowIcon(QIcon(resource_path("pngegg.ico")))
-    
+
+    if args.log_file:
+        get_event_log().open_file(args.log_file)
     window = LeagueAssistantApp()
-    
-    if cached_data:
-        window.champion_select_widget.update_champions_data(cached_data)
-        window.status_label.setText(f"Ready - Loaded {len(cached_data)} champions (cached)")
-    
+    if args.record:
+        window.lcu_connector.start_recording(args.record)
+    StartupProfile.mark("window built")
+    control_server = None
+    if args.control_port:
+        from ControlAPI import ControlServer
+        control_server = ControlServer(window.controller, args.control_port)
+        control_server.start()
+
     window.show()
-    sys.exit(app.exec_())
+    code = app.exec_()
+    if control_server:
+        control_server.stop()
+    sys.exit(code)
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
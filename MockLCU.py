@@ -0,0 +1,467 @@
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import secrets
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+from aiohttp import web, WSMsgType
+import ChampionCatalog
+from LatencyStats import RollingHistogram
+
+CERT_FILE = os.path.join(tempfile.gettempdir(), "mock_lcu_cert.pem")
+KEY_FILE = os.path.join(tempfile.gettempdir(), "mock_lcu_key.pem")
+POSITIONS = ["top", "jungle", "middle", "bottom", "utility"]
+# Snake pick order by cell id, my team is cells 0-4 and the enemy team 5-9
+PICK_ORDER = [[0], [5, 6], [1, 2], [7, 8], [3, 4], [9]]
+TURN_TIME_MS = 30000
+
+# (delay in seconds, step) for one queue pop through game end, delays are divided by --speed
+DEFAULT_SCENARIO = [
+    (0.0, "pop_queue"),
+    (3.0, "start_champ_select"),
+    (5.0, "next_turn"),
+    (0.5, "timer_ticks"),
+    (9.5, "next_turn"),
+    (0.5, "timer_ticks"),
+    (9.5, "next_turn"),
+    (0.5, "timer_ticks"),
+    (9.5, "next_turn"),
+    (0.5, "timer_ticks"),
+    (9.5, "next_turn"),
+    (0.5, "timer_ticks"),
+    (9.5, "next_turn"),
+    (0.5, "timer_ticks"),
+    (9.5, "next_turn"),
+    (0.5, "timer_ticks"),
+    (9.5, "next_turn"),
+    (5.0, "start_game"),
+    (5.0, "end_game"),
+]
+
+
+def ensure_certificate():
+    """Create a self-signed certificate for 127.0.0.1 with the openssl CLI, once per machine"""
+    if not (os.path.exists(CERT_FILE) and os.path.exists(KEY_FILE)):
+        try:
+            subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "365",
+                            "-subj", "/CN=127.0.0.1", "-keyout", KEY_FILE, "-out", CERT_FILE],
+                           check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise RuntimeError(f"Could not create a certificate with openssl: {e}")
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(CERT_FILE, KEY_FILE)
+    return context
+
+
+def mock_champions():
+    """name -> numeric id, from the champion cache when there is one"""
+    catalog = ChampionCatalog.load_cache()
+    if catalog:
+        return dict(catalog.keys_by_name)
+    return {f"Champion{i}": i for i in range(1, 161)}
+
+
+class MockLobby:
+    """One simulated League client: the REST endpoints LCUConnector uses, a WAMP websocket
+    pushing OnJsonApiEvent frames, and a scripted queue/champ select/game scenario.
+
+    latency (seconds) delays every request and failure_rate is the chance a request answers 500.
+    """
+
+    def __init__(self, name, champions, latency=0.0, failure_rate=0.0, local_cell=0, seed=None):
+        self.name = name
+        self.champions = champions
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.local_cell = local_cell
+        self.password = secrets.token_urlsafe(16)
+        self._authorization = "Basic " + base64.b64encode(f"riot:{self.password}".encode()).decode()
+        self.port = None
+        self.summoner_id = random.Random(name).randint(10 ** 6, 10 ** 7)
+        self.random = random.Random(seed)
+        self.subscribed = asyncio.Event()
+        self._sockets = set()
+        self._runner = None
+
+        self.gameflow_phase = "None"
+        self.ready_check = {"state": "Invalid", "playerResponse": "None", "timer": 0}
+        self.session = None
+        self.game_id = 0
+        self.turn = -1
+        self.turn_started = None
+
+        self.requests = 0
+        self.failures = 0
+        self.events = 0
+        self.accepted = 0
+        self.locked = []
+        self.rejected = 0
+        self.missed = 0
+        self.lock_latency = RollingHistogram()
+
+    def lockfile_string(self):
+        """The pid:pid:port:password string lcu_driver's Connection accepts"""
+        return f"{os.getpid()}:{os.getpid()}:{self.port}:{self.password}"
+
+    async def start(self, ssl_context, port=0):
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/", self._websocket)
+        app.router.add_get("/riotclient/region-locale", self._region_locale)
+        app.router.add_get("/lol-summoner/v1/current-summoner", self._current_summoner)
+        app.router.add_get("/lol-champions/v1/inventories/{summoner_id}/champions-minimal", self._champions_minimal)
+        app.router.add_get("/lol-matchmaking/v1/ready-check", self._get_ready_check)
+        app.router.add_post("/lol-matchmaking/v1/ready-check/accept", self._accept)
+        app.router.add_get("/lol-gameflow/v1/gameflow-phase", self._get_gameflow_phase)
+        app.router.add_get("/lol-champ-select/v1/session", self._get_session)
+        app.router.add_patch("/lol-champ-select/v1/session/actions/{action_id}", self._patch_action)
+        app.router.add_get("/lol-champ-select/v1/pickable-champion-ids", self._pickable)
+        app.router.add_get("/lol-champ-select/v1/bannable-champion-ids", self._bannable)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port, ssl_context=ssl_context)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        for ws in list(self._sockets):
+            await ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+
+    # HTTP
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        if request.path == "/riotclient/region-locale":
+            return await handler(request)
+        if request.headers.get("Authorization") != self._authorization:
+            return web.json_response({"message": "Unauthorized"}, status=401)
+        if request.path == "/":
+            return await handler(request)
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            self.failures += 1
+            return self._error(500, "Injected failure")
+        return await handler(request)
+
+    @staticmethod
+    def _error(status, message):
+        return web.json_response({"errorCode": "RPC_ERROR", "httpStatus": status, "message": message}, status=status)
+
+    async def _region_locale(self, request):
+        return web.json_response({"locale": "en_US", "region": "EUW", "webLanguage": "en", "webRegion": "euw"})
+
+    async def _current_summoner(self, request):
+        return web.json_response({"summonerId": self.summoner_id, "displayName": self.name})
+
+    async def _champions_minimal(self, request):
+        if int(request.match_info["summoner_id"]) != self.summoner_id:
+            return self._error(404, "Unknown summoner")
+        return web.json_response([
+            {"id": champion_id, "name": name, "freeToPlay": False, "ownership": {"owned": True, "rental": {"rented": False}}}
+            for name, champion_id in self.champions.items()])
+
+    async def _get_ready_check(self, request):
+        if self.ready_check["state"] == "Invalid":
+            return self._error(404, "Not attached to a matchmaking queue.")
+        return web.json_response(self.ready_check)
+
+    async def _accept(self, request):
+        if self.ready_check["state"] != "InProgress":
+            return self._error(500, "No ready check in progress")
+        self.ready_check["playerResponse"] = "Accepted"
+        self.accepted += 1
+        self.publish("/lol-matchmaking/v1/ready-check", "Update", self.ready_check)
+        return web.Response(status=204)
+
+    async def _get_gameflow_phase(self, request):
+        return web.json_response(self.gameflow_phase)
+
+    async def _get_session(self, request):
+        if self.session is None:
+            return self._error(404, "No active delegate")
+        return web.json_response(self.session)
+
+    async def _pickable(self, request):
+        if self.session is None:
+            return self._error(404, "No active delegate")
+        return web.json_response(sorted(set(self.champions.values()) - self._taken()))
+
+    async def _bannable(self, request):
+        if self.session is None:
+            return self._error(404, "No active delegate")
+        return web.json_response(sorted(set(self.champions.values()) - self._taken()))
+
+    async def _patch_action(self, request):
+        action = self._action(int(request.match_info["action_id"]))
+        if action is None or action["actorCellId"] != self.local_cell:
+            return self._error(404, "Unknown action")
+        try:
+            body = await request.json()
+        except ValueError:
+            body = {}
+        champion_id = body.get("championId", action["championId"])
+        if champion_id and champion_id in self._taken(exclude=action):
+            self.rejected += 1
+            return self._error(400, "Champion is not available")
+
+        action["championId"] = champion_id
+        if body.get("completed"):
+            if not action["isInProgress"]:
+                self.rejected += 1
+                return self._error(409, "Action is not in progress")
+            action["completed"] = True
+            action["isInProgress"] = False
+            self.locked.append((action["type"], champion_id))
+            self.lock_latency.record_since(self.turn_started)
+            self._sync_members()
+        self.publish_session()
+        return web.Response(status=204)
+
+    # Websocket
+
+    async def _websocket(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._sockets.add(ws)
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                opcode, topic = json.loads(msg.data)[:2]
+                if opcode == 5 and topic == "OnJsonApiEvent":
+                    # lcu_driver discards the frame following its subscribe
+                    await ws.send_json([8, "OnJsonApiEvent", {"data": None, "eventType": "Subscribed", "uri": ""}])
+                    self.subscribed.set()
+        finally:
+            self._sockets.discard(ws)
+        return ws
+
+    def publish(self, uri, event_type, data):
+        frame = json.dumps([8, "OnJsonApiEvent", {"data": data, "eventType": event_type, "uri": uri}])
+        for ws in list(self._sockets):
+            if not ws.closed:
+                asyncio.ensure_future(ws.send_str(frame))
+                self.events += 1
+
+    def publish_session(self, event_type="Update"):
+        self.publish("/lol-champ-select/v1/session", event_type, self.session)
+
+    def set_gameflow_phase(self, phase):
+        self.gameflow_phase = phase
+        self.publish("/lol-gameflow/v1/gameflow-phase", "Update", phase)
+
+    # Champ select bookkeeping
+
+    def _actions(self):
+        for group in self.session["actions"]:
+            yield from group
+
+    def _action(self, action_id):
+        if self.session is None:
+            return None
+        return next((action for action in self._actions() if action["id"] == action_id), None)
+
+    def _taken(self, exclude=None):
+        return {action["championId"] for action in self._actions()
+                if action is not exclude and action["championId"] and action["completed"]}
+
+    def _sync_members(self):
+        picks = {action["actorCellId"]: action["championId"] for action in self._actions()
+                 if action["type"] == "pick" and action["completed"]}
+        for member in self.session["myTeam"] + self.session["theirTeam"]:
+            member["championId"] = picks.get(member["cellId"], 0)
+        bans = [action for action in self._actions() if action["type"] == "ban" and action["completed"]]
+        self.session["bans"] = {
+            "myTeamBans": [action["championId"] for action in bans if action["actorCellId"] < 5],
+            "theirTeamBans": [action["championId"] for action in bans if action["actorCellId"] >= 5],
+        }
+
+    # Scenario steps
+
+    async def pop_queue(self):
+        self.set_gameflow_phase("ReadyCheck")
+        self.ready_check = {"state": "InProgress", "playerResponse": "None", "timer": 0}
+        self.publish("/lol-matchmaking/v1/ready-check", "Update", self.ready_check)
+
+    async def start_champ_select(self):
+        self.ready_check = {"state": "Invalid", "playerResponse": "None", "timer": 0}
+        self.game_id += 1
+        self.turn = -1
+        action_id = iter(range(1, 100))
+        bans = [{"id": next(action_id), "actorCellId": cell, "type": "ban", "championId": 0,
+                 "completed": False, "isInProgress": False} for cell in range(10)]
+        picks = [[{"id": next(action_id), "actorCellId": cell, "type": "pick", "championId": 0,
+                   "completed": False, "isInProgress": False} for cell in group] for group in PICK_ORDER]
+        self.session = {
+            "gameId": self.game_id,
+            "localPlayerCellId": self.local_cell,
+            "myTeam": [{"cellId": cell, "championId": 0, "assignedPosition": POSITIONS[cell]} for cell in range(5)],
+            "theirTeam": [{"cellId": cell, "championId": 0, "assignedPosition": ""} for cell in range(5, 10)],
+            "bans": {"myTeamBans": [], "theirTeamBans": []},
+            "timer": {"phase": "PLANNING", "adjustedTimeLeftInPhase": TURN_TIME_MS},
+            "actions": [bans] + picks,
+        }
+        self.set_gameflow_phase("ChampSelect")
+        self.publish_session("Create")
+
+    async def next_turn(self):
+        """Finish the current turn (other players lock a random champion) and start the next one"""
+        if self.session is None:
+            return
+        if self.turn >= 0:
+            for action in self.session["actions"][self.turn]:
+                if action["completed"]:
+                    continue
+                if action["actorCellId"] == self.local_cell:
+                    self.missed += 1
+                    action["championId"] = 0
+                else:
+                    available = sorted(set(self.champions.values()) - self._taken())
+                    action["championId"] = self.random.choice(available) if available else 0
+                action["completed"] = True
+                action["isInProgress"] = False
+            self._sync_members()
+
+        self.turn += 1
+        if self.turn < len(self.session["actions"]):
+            for action in self.session["actions"][self.turn]:
+                action["isInProgress"] = True
+            self.session["timer"] = {"phase": "BAN_PICK", "adjustedTimeLeftInPhase": TURN_TIME_MS}
+            self.turn_started = time.perf_counter()
+        else:
+            self.session["timer"] = {"phase": "FINALIZATION", "adjustedTimeLeftInPhase": TURN_TIME_MS}
+        self.publish_session()
+
+    async def timer_ticks(self, count=5):
+        """A burst of updates where only the timer moves, like the client sends every second"""
+        if self.session is None:
+            return
+        for _ in range(count):
+            self.session["timer"]["adjustedTimeLeftInPhase"] -= 1000
+            self.publish_session()
+            await asyncio.sleep(0)
+
+    async def start_game(self):
+        if self.session is not None:
+            self.session["timer"] = {"phase": "GAME_STARTING", "adjustedTimeLeftInPhase": 0}
+            self.publish_session()
+            self.session = None
+            self.publish("/lol-champ-select/v1/session", "Delete", None)
+        self.set_gameflow_phase("GameStart")
+        self.set_gameflow_phase("InProgress")
+
+    async def end_game(self):
+        self.set_gameflow_phase("EndOfGame")
+        self.set_gameflow_phase("None")
+
+    async def run_scenario(self, scenario=DEFAULT_SCENARIO, speed=1.0, rounds=1):
+        """Run the scenario rounds times, once a client has subscribed to events"""
+        await self.subscribed.wait()
+        for _ in range(rounds):
+            for delay, step in scenario:
+                await asyncio.sleep(delay / speed)
+                await getattr(self, step)()
+
+
+async def start_lobbies(count, base_port=0, latency=0.0, failure_rate=0.0, seed=None):
+    """Start count lobbies, each on its own port (consecutive from base_port, or random ones)"""
+    ssl_context = ensure_certificate()
+    champions = mock_champions()
+    lobbies = []
+    for i in range(count):
+        lobby = MockLobby(f"Mock{i}", champions, latency, failure_rate, local_cell=i % 5,
+                          seed=None if seed is None else seed + i)
+        await lobby.start(ssl_context, base_port + i if base_port else 0)
+        lobbies.append(lobby)
+    return lobbies
+
+
+def write_picks_bans(champion_names, path, seed=None):
+    """Give every role a few picks and bans drawn from champion_names, for connected or replaying clients"""
+    rng = random.Random(seed)
+    names = sorted(champion_names)
+    picks_bans = {position.upper(): {"picks": rng.sample(names, 3), "bans": rng.sample(names, 2)}
+                  for position in POSITIONS}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(picks_bans, f)
+
+
+async def run(args):
+    lobbies = await start_lobbies(args.lobbies, args.port, args.latency / 1000, args.failure_rate, args.seed)
+    for lobby in lobbies:
+        print(f"{lobby.name}: https://127.0.0.1:{lobby.port} lockfile {lobby.lockfile_string()}")
+
+    clients = []
+    if args.connect:
+        from lcu_driver.connection import Connection
+        from LCUConnector import LCUConnector
+        from EventLog import get_event_log
+        # As in headless mode, names resolve from the catalog even when a connector's inventory request failed
+        catalog = ChampionCatalog.load_cache() or ChampionCatalog.ChampionCatalog("mock", [
+            ChampionCatalog.Champion(key, name, name, "", f"{name}.png") for name, key in lobbies[0].champions.items()])
+        ChampionCatalog.set_catalog(catalog)
+        picks_bans_file = os.path.join(tempfile.gettempdir(), "mock_lcu_picks_bans.json")
+        write_picks_bans(lobbies[0].champions, picks_bans_file, args.seed)
+        if args.verbose:
+            get_event_log().add_listener(lambda event: print(f"[{event.source}] {event.message}"))
+        for lobby in lobbies:
+            lcu = LCUConnector(picks_bans_file=picks_bans_file, name=lobby.name)
+            lcu.auto_accept_enabled = lcu.auto_select_enabled = True
+            clients.append(asyncio.ensure_future(Connection(lcu.connector, lobby.lockfile_string()).init()))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(lobby.run_scenario(speed=args.speed, rounds=args.rounds) for lobby in lobbies))
+    elapsed = time.perf_counter() - start
+    # Let the clients react to the last events before closing their websockets
+    await asyncio.sleep(0.5)
+    for lobby in lobbies:
+        await lobby.stop()
+    await asyncio.gather(*clients, return_exceptions=True)
+
+    locked = sum(len(lobby.locked) for lobby in lobbies)
+    print(f"{len(lobbies)} lobbies x {args.rounds} rounds in {elapsed:.2f}s: "
+          f"{sum(lobby.requests for lobby in lobbies)} requests ({sum(lobby.failures for lobby in lobbies)} failed on purpose), "
+          f"{sum(lobby.events for lobby in lobbies)} events, {sum(lobby.accepted for lobby in lobbies)} accepts, "
+          f"{locked} lock-ins, {sum(lobby.rejected for lobby in lobbies)} rejected, {sum(lobby.missed for lobby in lobbies)} missed turns")
+    latency = RollingHistogram(size=max(1, locked))
+    for lobby in lobbies:
+        for sample in lobby.lock_latency._samples:
+            latency.record(sample)
+    snapshot = latency.snapshot()
+    if snapshot:
+        print(f"Turn start to lock-in: p50 {snapshot['p50']:.1f} ms, p90 {snapshot['p90']:.1f} ms, "
+              f"p99 {snapshot['p99']:.1f} ms, max {snapshot['max']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the League client API")
+    parser.add_argument("--lobbies", type=int, default=1, help="number of simulated clients, one port each")
+    parser.add_argument("--port", type=int, default=0, help="first port, consecutive ports after it (default: random)")
+    parser.add_argument("--latency", type=float, default=0.0, help="added latency per request in milliseconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="chance a request fails with a 500")
+    parser.add_argument("--speed", type=float, default=1.0, help="scenario speed multiplier")
+    parser.add_argument("--rounds", type=int, default=1, help="queue pops to run per lobby")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--connect", action="store_true", help="connect an LCUConnector with auto accept/select to every lobby")
+    parser.add_argument("--verbose", action="store_true", help="print connector events")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except RuntimeError as e:
+        print(e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
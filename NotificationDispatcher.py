@@ -0,0 +1,278 @@
+import argparse
+import queue
+import random
+import threading
+import time
+import LatencyStats
+import EventLog
+from ConfigStore import get_config_store
+
+QUEUE_SIZE = 32
+MAX_ATTEMPTS = 4
+RETRY_DELAY = 1.0
+DEDUP_WINDOW = 120.0
+NOTIFICATION_KEYS = ("whatsapp_notifications", "webhook_notifications", "desktop_notifications")
+
+
+class PermanentError(Exception):
+    """Raised by a backend when retrying cannot help (bad credentials, bad number...)"""
+
+
+class NotificationBackend:
+    """Delivers one message. send() raises on failure: PermanentError stops retries, anything else is retried."""
+    name = "notification"
+
+    def send(self, message):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class WebhookBackend(NotificationBackend):
+    """POSTs {"text": message} as JSON to a URL (Discord, Slack, ntfy...) over one kept-alive session"""
+    name = "webhook"
+
+    def __init__(self, url, timeout=5):
+        import requests
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, message):
+        response = self.session.post(self.url, json={"text": message, "content": message}, timeout=self.timeout)
+        if 400 <= response.status_code < 500 and response.status_code != 429:
+            raise PermanentError(f"Webhook answered {response.status_code}")
+        response.raise_for_status()
+
+    def close(self):
+        self.session.close()
+
+
+class DesktopBackend(NotificationBackend):
+    """Shows the message through a callable, e.g. a Qt signal connected to a tray icon"""
+    name = "desktop"
+
+    def __init__(self, show):
+        self.show = show
+
+    def send(self, message):
+        self.show("Queue Assist", message)
+
+
+class LocalBackend(NotificationBackend):
+    """In-process stand-in used by the delivery check at the end of this file: waits latency
+    seconds, fails with failure_rate, and keeps every delivered (message, time.perf_counter())."""
+    name = "local"
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.delivered = []
+
+    def send(self, message):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            raise ConnectionError("Injected failure")
+        self.delivered.append((message, time.perf_counter()))
+
+
+def backends_from_config(config, desktop_show=None):
+    """Build the enabled backends from the notification sections of config.json"""
+    backends = []
+    whatsapp = config.get("whatsapp_notifications", {})
+    if whatsapp.get("enabled"):
+        from WhatsAppNotifier import TwilioBackend
+        try:
+            backends.append(TwilioBackend(whatsapp.get("twilio_sid"), whatsapp.get("twilio_token"),
+                                          whatsapp.get("from_number"), whatsapp.get("to_number")))
+        except Exception as e:
+            EventLog.get_event_log().add("notification", f"WhatsApp notifications disabled: {e}", EventLog.WARNING)
+    webhook = config.get("webhook_notifications", {})
+    if webhook.get("enabled") and webhook.get("url"):
+        backends.append(WebhookBackend(webhook["url"]))
+    desktop = config.get("desktop_notifications", {})
+    if desktop.get("enabled") and desktop_show:
+        backends.append(DesktopBackend(desktop_show))
+    return backends
+
+
+class NotificationDispatcher:
+    """Delivers notifications from one long-lived worker thread.
+
+    notify() only enqueues (bounded, a full queue drops the message) and never blocks the caller.
+    Every backend gets each message, with up to max_attempts tries and exponential backoff.
+    Messages with the same key within dedup_window seconds are sent once. Time from notify()
+    to delivery is recorded in the notification latency histogram.
+    """
+
+    def __init__(self, backends=None, queue_size=QUEUE_SIZE, max_attempts=MAX_ATTEMPTS,
+                 retry_delay=RETRY_DELAY, dedup_window=DEDUP_WINDOW):
+        self.backends = list(backends or [])
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.dedup_window = dedup_window
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.deduplicated = 0
+        self._recent = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def set_backends(self, backends):
+        with self._lock:
+            old, self.backends = self.backends, list(backends)
+        for backend in old:
+            backend.close()
+
+    def current_backends(self):
+        with self._lock:
+            return list(self.backends)
+
+    def notify(self, message, key=None, on_done=None):
+        """Queue message for every backend; returns False if it was a duplicate or the queue is full.
+
+        on_done(backend_name, ok, error) is called from the worker thread after each delivery.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if key is not None:
+                if now - self._recent.get(key, -self.dedup_window) < self.dedup_window:
+                    self.deduplicated += 1
+                    return False
+                self._recent[key] = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        try:
+            self.queue.put_nowait((message, on_done, time.perf_counter()))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            message, on_done, queued_at = item
+            for backend in self.current_backends():
+                error = self._deliver(backend, message)
+                if error is None:
+                    self.sent += 1
+                    LatencyStats.histogram(LatencyStats.NOTIFICATION_DELIVERY).record_since(queued_at)
+                else:
+                    self.failed += 1
+                if on_done:
+                    on_done(backend.name, error is None, error)
+
+    def _deliver(self, backend, message):
+        """Send with retries; returns None on success or the last error message"""
+        delay = self.retry_delay
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                backend.send(message)
+                return None
+            except PermanentError as e:
+                return str(e)
+            except Exception as e:
+                if attempt == self.max_attempts or self._stop_event.wait(delay):
+                    return str(e)
+                delay *= 2
+
+    def stop(self, timeout=2.0):
+        """Stop retrying, deliver what is queued and let the worker exit"""
+        self._stop_event.set()
+        if self._thread:
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+        self.set_backends([])
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+class _ConfiguredDispatcher(NotificationDispatcher):
+    """The process-wide dispatcher, whose backends follow the notification sections of config.json.
+
+    Backends are built by the worker before the first delivery after a change, so twilio is
+    only imported once a notification is actually sent.
+    """
+
+    def __init__(self, config_store):
+        super().__init__()
+        self.config_store = config_store
+        self.desktop_show = None
+        self._stale = True
+        config_store.add_listener(self.on_config_changed)
+
+    def set_desktop_handler(self, show):
+        self.desktop_show = show
+        self.reconfigure()
+
+    def reconfigure(self):
+        self._stale = True
+
+    def current_backends(self):
+        if self._stale:
+            self._stale = False
+            self.set_backends(backends_from_config(self.config_store.data, self.desktop_show))
+        return super().current_backends()
+
+    def on_config_changed(self, keys):
+        if any(key in keys for key in NOTIFICATION_KEYS):
+            self.reconfigure()
+
+
+def get_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = _ConfiguredDispatcher(get_config_store())
+        return _dispatcher
+
+
+def main():
+    """Measure delivery through the retry path with a LocalBackend, no network involved"""
+    parser = argparse.ArgumentParser(description="Check notification delivery latency against a local backend")
+    parser.add_argument("--count", type=int, default=100, help="notifications to send")
+    parser.add_argument("--latency", type=float, default=5.0, help="backend latency per attempt in milliseconds")
+    parser.add_argument("--failure-rate", type=float, default=0.2, help="chance an attempt fails and is retried")
+    parser.add_argument("--retry-delay", type=float, default=10.0, help="first retry delay in milliseconds")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    backend = LocalBackend(args.latency / 1000, args.failure_rate, args.seed)
+    dispatcher = NotificationDispatcher([backend], queue_size=args.count, retry_delay=args.retry_delay / 1000)
+    start = time.perf_counter()
+    for i in range(args.count):
+        dispatcher.notify(f"Notification {i}", key=f"check:{i}")
+    # Same keys again: all of them are deduplicated
+    for i in range(args.count):
+        dispatcher.notify(f"Notification {i}", key=f"check:{i}")
+    # stop() cancels pending retries, so wait for every delivery to finish first
+    while dispatcher.sent + dispatcher.failed < args.count:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    dispatcher.stop()
+
+    print(f"{dispatcher.sent} delivered, {dispatcher.failed} failed after {dispatcher.max_attempts} attempts, "
+          f"{dispatcher.deduplicated} deduplicated, {dispatcher.dropped} dropped in {elapsed:.2f}s")
+    snapshot = LatencyStats.histogram(LatencyStats.NOTIFICATION_DELIVERY).snapshot()
+    if snapshot:
+        print(f"notify() to delivery: p50 {snapshot['p50']:.1f} ms, p90 {snapshot['p90']:.1f} ms, "
+              f"p99 {snapshot['p99']:.1f} ms, max {snapshot['max']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import json
+import os
+import threading
+import time
+import EventLog
+
+ROLES = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "SUPPORT"]
+# The LCU calls the support position UTILITY; the short forms are for roles typed by hand
+ROLE_ALIASES = {
+    "UTILITY": "SUPPORT", "SUP": "SUPPORT", "SUPP": "SUPPORT",
+    "MID": "MIDDLE",
+    "BOT": "BOTTOM", "ADC": "BOTTOM",
+    "JG": "JUNGLE", "JUNG": "JUNGLE", "JUNGLER": "JUNGLE",
+}
+WRITE_DELAY = 0.5
+MAX_WRITE_DELAY = 2.0
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    """Write JSON to a temp file next to path and rename it over path, so a crash never leaves half a file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class WriteBehind:
+    """One background thread that saves dirty stores once edits have settled.
+
+    Each schedule() pushes the write back by delay, but never past max_delay from the first
+    unsaved edit, so a burst of edits becomes one write.
+    """
+
+    def __init__(self, delay=WRITE_DELAY, max_delay=MAX_WRITE_DELAY):
+        self.delay = delay
+        self.max_delay = max_delay
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def schedule(self, store):
+        now = time.monotonic()
+        with self._condition:
+            first, _ = self._pending.get(store, (now, None))
+            self._pending[store] = (first, min(now + self.delay, first + self.max_delay))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def cancel(self, store):
+        with self._condition:
+            self._pending.pop(store, None)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                now = time.monotonic()
+                due = [store for store, (_, deadline) in self._pending.items() if deadline <= now]
+                if not due:
+                    self._condition.wait(min(deadline for _, deadline in self._pending.values()) - now)
+                    continue
+                for store in due:
+                    del self._pending[store]
+            for store in due:
+                store.write()
+
+
+write_behind = WriteBehind()
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class PicksBansStore:
+    """The picks and bans of every role, kept in memory and shared by the GUI and the connector.
+
+    Edits replace whole lists, so readers on other threads always see a complete list. Listeners
+    are called with the changed role (None for all roles) on the thread that made the edit.
+    The file is written behind the edits, atomically and off the calling thread.
+    """
+
+    def __init__(self, path, write_behind=write_behind):
+        self.path = path
+        self.write_behind = write_behind
+        self.listeners = []
+        self.writes = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._written_version = 0
+        self.data = self.load()
+        if self._version:
+            # Save the migrated data in the current format
+            self.write_behind.schedule(self)
+
+    def load(self):
+        data = None
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+        except (OSError, ValueError) as e:
+            EventLog.get_event_log().add("settings", f"Error loading {self.path}: {e}", EventLog.ERROR)
+
+        migrated = False
+        if data is None:
+            data = {}
+            # Migrate from the old picks.txt/bans.txt next to the file if present
+            migrated = self._migrate_text_files(data)
+        for alias, role in ROLE_ALIASES.items():
+            if alias in data and role not in data:
+                data[role] = data.pop(alias)
+                migrated = True
+        for role in ROLES:
+            entry = data.setdefault(role, {})
+            entry.setdefault("picks", [])
+            entry.setdefault("bans", [])
+        if migrated:
+            self._version += 1
+        return data
+
+    def _migrate_text_files(self, data):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        lists = {}
+        for kind, name in (("picks", "picks.txt"), ("bans", "bans.txt")):
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    lists[kind] = [line.strip() for line in f if line.strip()]
+        if not lists:
+            return False
+        for role in ROLES:
+            data[role] = {"picks": list(lists.get("picks", [])), "bans": list(lists.get("bans", []))}
+        return True
+
+    @staticmethod
+    def role_key(role):
+        role = (role or "").upper()
+        return ROLE_ALIASES.get(role, role)
+
+    def lists(self, role):
+        """{"picks": [...], "bans": [...]} of a role; treat the lists as read-only"""
+        return self.data.get(self.role_key(role), {"picks": [], "bans": []})
+
+    def snapshot(self):
+        """A copy of every role's lists, consistent even while another thread edits them"""
+        with self._lock:
+            return {role: {kind: list(names) for kind, names in entry.items()} for role, entry in self.data.items()}
+
+    def set(self, role, kind, names):
+        """Replace the picks or bans of a role"""
+        role = self.role_key(role)
+        with self._lock:
+            entry = dict(self.data.get(role, {"picks": [], "bans": []}))
+            entry[kind] = list(names)
+            self.data[role] = entry
+            self._version += 1
+        self._changed(role)
+
+    def replace(self, picks_bans):
+        """Replace every role at once"""
+        data = {self.role_key(role): {"picks": list(entry.get("picks", [])), "bans": list(entry.get("bans", []))}
+                for role, entry in picks_bans.items()}
+        for role in ROLES:
+            data.setdefault(role, {"picks": [], "bans": []})
+        with self._lock:
+            self.data = data
+            self._version += 1
+        self._changed(None)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _changed(self, role):
+        self.write_behind.schedule(self)
+        for listener in list(self.listeners):
+            listener(role)
+
+    def write(self):
+        with self._write_lock:
+            with self._lock:
+                version = self._version
+                snapshot = {role: dict(entry) for role, entry in self.data.items()}
+            if version == self._written_version:
+                return
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                write_json_atomic(self.path, snapshot, ensure_ascii=False, indent=2)
+                self._written_version = version
+                self.writes += 1
+            except OSError as e:
+                EventLog.get_event_log().add("settings", f"Error writing to {self.path}: {e}", EventLog.ERROR)
+
+    def flush(self):
+        """Write unsaved edits right away, e.g. on exit"""
+        self.write_behind.cancel(self)
+        self.write()
+
+
+def store_for(path):
+    """The shared store of a picks/bans file, so every user of the same file sees the same lists"""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = PicksBansStore(path)
+        return store
+
+
+def flush_all():
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
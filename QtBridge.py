@@ -0,0 +1,22 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+from EventBus import STATUS_CHANGED, STATE_CHANGED
+
+
+class BusSignals(QObject):
+    """Qt adapter of an EventBus: re-emits its topics as signals.
+
+    Bus events are published on the connector's loop thread; Qt queues the signals to the
+    thread of each receiver, so GUI slots run on the GUI thread.
+    """
+    # Account name ("" for the single connector) and whether its client is connected
+    status_changed = pyqtSignal(str, bool)
+    # Account name of a connector whose state() changed
+    state_changed = pyqtSignal(str)
+
+    def __init__(self, bus, parent=None):
+        super().__init__(parent)
+        bus.subscribe(STATUS_CHANGED, self._on_status_changed)
+        bus.subscribe(STATE_CHANGED, lambda name: self.state_changed.emit(name or ""))
+
+    def _on_status_changed(self, name, connected):
+        self.status_changed.emit(name or "", connected)
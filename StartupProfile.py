@@ -0,0 +1,46 @@
+import time
+
+_phases = []
+# Set by --profile-startup, cleared once the profile is printed
+enabled = False
+
+
+def mark(phase):
+    """Record that phase finished now; does nothing unless profiling is on"""
+    if enabled:
+        _phases.append((phase, time.perf_counter()))
+
+
+def process_started():
+    """perf_counter() time the OS started this process, or None if psutil is not available"""
+    try:
+        import psutil
+        age = time.time() - psutil.Process().create_time()
+    except Exception:
+        return None
+    return time.perf_counter() - age
+
+
+def finish(phase):
+    """Mark the last phase and print the breakdown, once; later calls (e.g. reconnects) do nothing"""
+    global enabled
+    if not enabled:
+        return
+    mark(phase)
+    enabled = False
+    report()
+    _phases.clear()
+
+
+def report():
+    phases = list(_phases)
+    start = process_started()
+    if start is None:
+        start = phases[0][1]
+        print("Startup profile (from the first mark, install psutil to include interpreter start):")
+    else:
+        print("Startup profile (from process start):")
+    previous = start
+    for phase, at in phases:
+        print(f"  {phase:<28} +{(at - previous) * 1000:7.1f} ms  at {(at - start) * 1000:7.1f} ms")
+        previous = at
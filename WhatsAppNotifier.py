@@ -1,36 +1,31 @@
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
+from NotificationDispatcher import NotificationBackend, PermanentError
 
-def send_notification(to_number, message, twilio_sid, twilio_token, from_number):
-    """
-    Sends a WhatsApp message using the Twilio API.
 
-    Args:
-        to_number (str): The recipient's WhatsApp phone number.
-        message (str): The message to be sent.
-        twilio_sid (str): The Twilio Account SID.
-        twilio_token (str): The Twilio Auth Token.
-        from_number (str): The Twilio phone number.
-        
-    Returns:
-        bool: True if the message was sent successfully, False otherwise.
+class TwilioBackend(NotificationBackend):
+    """WhatsApp backend for NotificationDispatcher.
+
+    The Twilio client, and with it the HTTP session, is created once and reused for every message.
+    4xx errors other than 429 (bad credentials or numbers) are not retried.
     """
-    try:
-        client = Client(twilio_sid, twilio_token)
-        message = client.messages.create(
-            body=message,
-            from_=f'whatsapp:{from_number}',
-            to=f'whatsapp:{to_number}'
-        )
-        if message.sid:
-            print(f"WhatsApp notification sent to {to_number}")
-            return True
-        else:
-            print(f"Failed to send WhatsApp notification: {message.error_message}")
-            return False
-    except TwilioRestException as e:
-        print(f"Failed to send WhatsApp notification: {e}")
-        return False
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return False
\ No newline at end of file
+    name = "WhatsApp"
+
+    def __init__(self, twilio_sid, twilio_token, from_number, to_number):
+        if not (twilio_sid and twilio_token and from_number and to_number):
+            raise ValueError("Twilio SID, token and both numbers are required")
+        self.client = Client(twilio_sid, twilio_token)
+        self.from_number = from_number
+        self.to_number = to_number
+
+    def send(self, message):
+        try:
+            self.client.messages.create(
+                body=message,
+                from_=f'whatsapp:{self.from_number}',
+                to=f'whatsapp:{self.to_number}'
+            )
+        except TwilioRestException as e:
+            if 400 <= e.status < 500 and e.status != 429:
+                raise PermanentError(e.msg)
+            raise